@@ -0,0 +1,4 @@
+"""Scripted performance scenarios for the pygame prototype.
+
+Run ``python -m benchmarks`` from the repository root; see ``__main__`` for options.
+"""
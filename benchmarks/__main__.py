@@ -0,0 +1,140 @@
+"""Run the benchmark scenarios and report JSON.
+
+Usage::
+
+    python -m benchmarks [--frames N] [--scenario NAME ...] [--output results.json]
+
+Each scenario is measured three ways: update and draw milliseconds per
+frame through ``BavarianRunGame`` on SDL's dummy video driver, ticks per
+second through a bare ``World`` as in ``--headless``, and peak Python heap
+while building the scenario and running it for a few seconds, along with
+the entity memory report of the world at the end of that run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from benchmarks.scenarios import SCENARIOS, Scenario  # noqa: E402
+from game import BavarianRunGame, World  # noqa: E402
+from profiler import percentile  # noqa: E402
+
+
+SEED = 1
+TICK_DT = 1.0 / 60
+MEMORY_TICKS = 300
+
+
+def frame_stats(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "mean_ms": round(sum(ordered) / len(ordered), 4),
+        "p50_ms": round(percentile(ordered, 0.50), 4),
+        "p95_ms": round(percentile(ordered, 0.95), 4),
+        "p99_ms": round(percentile(ordered, 0.99), 4),
+    }
+
+
+def measure_frames(scenario: Scenario, frames: int) -> dict[str, dict[str, float]]:
+    game = BavarianRunGame(level=scenario.build_level(), seed=SEED)
+    scenario.prepare(game)
+    update_ms: list[float] = []
+    draw_ms: list[float] = []
+    for _ in range(frames):
+        controls = scenario.controls(game)
+        started = time.perf_counter()
+        game.update(TICK_DT, controls)
+        updated = time.perf_counter()
+        game.draw()
+        drawn = time.perf_counter()
+        update_ms.append((updated - started) * 1000.0)
+        draw_ms.append((drawn - updated) * 1000.0)
+    game.profiler.close()
+    pygame.quit()
+    return {"update": frame_stats(update_ms), "draw": frame_stats(draw_ms)}
+
+
+def measure_headless(scenario: Scenario, frames: int) -> float:
+    world = World(scenario.build_level(), SEED)
+    scenario.prepare(world)
+    ticks = frames * 5
+    started = time.perf_counter()
+    for _ in range(ticks):
+        world.update(TICK_DT, scenario.controls(world))
+    return round(ticks / max(time.perf_counter() - started, 1e-9))
+
+
+def measure_memory(scenario: Scenario) -> tuple[int, dict[str, dict[str, int]]]:
+    tracemalloc.start()
+    world = World(scenario.build_level(), SEED)
+    scenario.prepare(world)
+    for _ in range(MEMORY_TICKS):
+        world.update(TICK_DT, scenario.controls(world))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, world.memory_report()
+
+
+def run(names: list[str], frames: int) -> dict:
+    results = {}
+    for name in names:
+        scenario = SCENARIOS[name]
+        frame_results = measure_frames(scenario, frames)
+        peak, entities = measure_memory(scenario)
+        results[name] = {
+            **frame_results,
+            "headless_ticks_per_s": measure_headless(scenario, frames),
+            "peak_heap_kib": peak // 1024,
+            "entities": entities,
+        }
+        print(
+            f"{name:<18} update {frame_results['update']['mean_ms']:7.3f} ms  "
+            f"draw {frame_results['draw']['mean_ms']:7.3f} ms  "
+            f"headless {results[name]['headless_ticks_per_s']:9.0f} ticks/s  "
+            f"heap {results[name]['peak_heap_kib']:7d} KiB",
+            file=sys.stderr,
+        )
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "frames": frames,
+        "seed": SEED,
+        "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "scenarios": results,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bavarian Mug Run performance scenarios")
+    parser.add_argument("--frames", type=int, default=600, help="Frames per scenario for update/draw timing")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Run only these scenarios")
+    parser.add_argument("--output", type=Path, help="Write JSON results here instead of stdout")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    report = run(args.scenario or list(SCENARIOS), args.frames)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
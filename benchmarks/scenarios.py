@@ -0,0 +1,111 @@
+"""Benchmark scenarios: a level, a starting state and a per-tick driver."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable
+
+from game import GOAL_BEERS, GROUND_Y, JUMP_REACH, TickInput, World, autopilot
+from levelgen import generate_level
+from levels import Level, compile_source, load_level
+
+
+def default_level() -> Level:
+    return load_level("default", GROUND_Y)
+
+
+def dense_collectibles_level() -> Level:
+    """10 000 collectibles scattered over the default 6000 px strip at three heights."""
+    collectibles = [{"x": i * 17 % 5950, "y": GROUND_Y - 60 * (i % 3)} for i in range(10_000)]
+    return compile_source({"name": "dense collectibles", "width": 6000, "collectibles": collectibles}, GROUND_Y)
+
+
+def crowded_level() -> Level:
+    """500 enemies patrolling the default 6000 px strip."""
+    enemies = [
+        {"kind": ("waiter", "police")[i % 2], "x": 300 + i * 11, "patrol": [250 + i * 11, 600 + i * 11], "speed": 80 + i % 40}
+        for i in range(500)
+    ]
+    return compile_source({"name": "crowd", "width": 6000, "enemies": enemies}, GROUND_Y)
+
+
+def long_level(width: int = 100_000) -> Level:
+    """The default level's layout repeated out to ``width`` pixels."""
+    period = 6000
+    platforms = []
+    enemies = []
+    base = default_level()
+    for offset in range(0, width - period + 1, period):
+        for i in range(base.platform_count):
+            x, y, w, h = base.platforms[4 * i:4 * i + 4]
+            platforms.append([x + offset, y, w, h])
+        for i in range(base.enemy_count):
+            kind, x, patrol_min, patrol_max = base.enemies[4 * i:4 * i + 4]
+            enemies.append(
+                {"kind": ("waiter", "police")[kind], "x": x + offset, "patrol": [patrol_min + offset, patrol_max + offset], "speed": base.enemy_speeds[i]}
+            )
+    data = {
+        "name": f"long {width}",
+        "width": width,
+        "platforms": platforms,
+        "collectible_rows": [{"start": 240, "stop": width - 200, "step": 220, "beer_chance": 0.6, "lift": [44, 40]}],
+        "platform_collectibles": {"chance": 0.75, "beer_chance": 0.65, "lift": [40, 34]},
+        "enemies": enemies,
+    }
+    return compile_source(data, GROUND_Y)
+
+
+def generated_level(width: int = 1_000_000) -> Level:
+    """A procedural level, built fresh rather than read from the generator cache."""
+    return generate_level(1, width, GROUND_Y, JUMP_REACH, GOAL_BEERS)
+
+
+def idle(world: World) -> TickInput:
+    return TickInput()
+
+
+def projectile_storm(world: World) -> None:
+    """Top both pools up to a few hundred projectiles around the player."""
+    x = world.player.rect.centerx
+    tick = world.ticks
+    while len(world.enemy_projectiles) < 300:
+        tick += 1
+        side = 1 if tick % 2 else -1
+        world.enemy_projectiles.spawn(x + side * (200 + tick * 37 % 700), 150 + tick * 53 % 280, -side * 420, 0.0)
+    while len(world.projectiles) < 200:
+        tick += 1
+        world.projectiles.spawn(x - 300 + tick * 29 % 600, 120 + tick * 17 % 200, (1, -1)[tick % 2] * 680, -120)
+
+
+@dataclass
+class Scenario:
+    name: str
+    build_level: Callable[[], Level]
+    running: bool = True
+    driver: Callable[[World], TickInput] = autopilot
+    inject: Callable[[World], None] | None = field(default=None)
+
+    def prepare(self, world: World) -> None:
+        if self.running:
+            world.start()
+
+    def controls(self, world: World) -> TickInput:
+        if self.inject is not None:
+            self.inject(world)
+        if self.running and world.state != "running":
+            world.start()
+        return self.driver(world)
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("default_run", default_level),
+        Scenario("collectibles_10k", dense_collectibles_level),
+        Scenario("enemies_500", crowded_level),
+        Scenario("projectile_storm", default_level, inject=projectile_storm),
+        Scenario("world_100k", long_level),
+        Scenario("generated_1m", generated_level),
+        Scenario("menu_idle", default_level, running=False, driver=idle),
+    )
+}
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""Step API over the simulation for bots, plus a multi-process vectorised runner.
+
+``BavarianRunEnv`` wraps a display-less ``World`` with the gymnasium-style
+``reset()`` / ``step(action)`` calls. Observations are flat float32 records
+(see ``OBS_FIELDS``) holding the player, the nearest enemies and the nearest
+projectiles relative to the player, with empty slots zeroed.
+
+``VectorEnv`` spreads N environments over worker processes. Actions,
+observations, rewards and done flags live in one shared-memory block, so a
+vector step is one small pipe message per worker and no copying. The block
+holds plain buffers; with NumPy installed, ``numpy.frombuffer(vec.obs,
+numpy.float32).reshape(n, OBS_SIZE)`` views it without a copy.
+``VectorEnv.rollout`` keeps a scripted policy inside the workers, so a
+rollout sends no messages per step at all.
+
+Usage::
+
+    python env.py [--envs N] [--workers N] [--steps N] [--level NAME]
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+
+import pygame
+
+from game import GROUND_Y, WIDTH, TickInput, World, autopilot, open_level
+from levels import Level, load_level
+
+
+# Discrete actions: (move_x, jump, throw) for every move direction and button mix.
+ACTIONS = tuple(TickInput(move, jump, throw) for move in (-1.0, 0.0, 1.0) for jump in (False, True) for throw in (False, True))
+
+PLAYER_FIELDS = ("x", "y", "vx", "vy", "on_ground", "facing", "lives", "invuln", "score", "beers", "pretzels", "goal_dx")
+NEAREST_ENEMIES = 8
+ENEMY_FIELDS = ("present", "dx", "dy", "kind", "direction")
+NEAREST_BOTTLES = 8
+NEAREST_MUGS = 4
+PROJECTILE_FIELDS = ("present", "dx", "dy", "vx", "vy")
+OBS_FIELDS = (
+    PLAYER_FIELDS
+    + tuple(f"enemy{i}.{name}" for i in range(NEAREST_ENEMIES) for name in ENEMY_FIELDS)
+    + tuple(f"bottle{i}.{name}" for i in range(NEAREST_BOTTLES) for name in PROJECTILE_FIELDS)
+    + tuple(f"mug{i}.{name}" for i in range(NEAREST_MUGS) for name in PROJECTILE_FIELDS)
+)
+OBS_SIZE = len(OBS_FIELDS)
+
+REWARD_WIN = 500.0
+REWARD_LIFE_LOST = -100.0
+DEFAULT_MAX_STEPS = 60 * 240
+
+
+class BavarianRunEnv:
+    """One running round per episode; an episode ends on game over, win or ``max_steps``."""
+
+    def __init__(self, level: Level | None = None, seed: int | None = None, tick_rate: int = 60, max_steps: int = DEFAULT_MAX_STEPS) -> None:
+        self.world = World(level, seed)
+        self.dt = 1.0 / tick_rate
+        self.max_steps = max_steps
+        self.steps = 0
+        self.obs = memoryview(bytearray(4 * OBS_SIZE)).cast("f")
+
+    def reset(self, seed: int | None = None) -> tuple[memoryview, dict]:
+        """Start a new round; ``seed`` reseeds the level randomness."""
+        world = self.world
+        if seed is not None:
+            world.seed = seed
+            world.rng.seed(seed)
+        world.start()
+        self.steps = 0
+        self.observe(self.obs)
+        return self.obs, self.info()
+
+    def step(self, action: int | TickInput) -> tuple[memoryview, float, bool, bool, dict]:
+        """Advance one tick; returns (observation, reward, terminated, truncated, info)."""
+        world = self.world
+        # Anything that is not a TickInput is an action index, including the
+        # NumPy integers an argmax policy returns.
+        controls = action if isinstance(action, TickInput) else ACTIONS[int(action)]
+        score, lives = world.score, world.player.lives
+        world.update(self.dt, controls)
+        self.steps += 1
+
+        reward = float(world.score - score) + REWARD_LIFE_LOST * (lives - world.player.lives)
+        if world.state == "win":
+            reward += REWARD_WIN
+        terminated = world.state != "running"
+        truncated = not terminated and self.steps >= self.max_steps
+        self.observe(self.obs)
+        return self.obs, reward, terminated, truncated, self.info()
+
+    def info(self) -> dict:
+        world = self.world
+        return {"state": world.state, "score": world.score, "beers": world.beers, "steps": self.steps}
+
+    def observe(self, out) -> None:
+        """Write the observation record into ``out``, any writable float32 buffer of OBS_SIZE."""
+        world = self.world
+        player = world.player
+        px, py = player.rect.x, player.rect.y
+        values = (
+            px,
+            py,
+            player.vel.x,
+            player.vel.y,
+            player.on_ground,
+            player.facing,
+            player.lives,
+            player.invuln_timer,
+            world.score,
+            world.beers,
+            world.pretzels,
+            world.world_width - px,
+        )
+        for i, value in enumerate(values):
+            out[i] = value
+
+        base = len(PLAYER_FIELDS)
+        view = pygame.Rect(px - WIDTH, 0, 2 * WIDTH, GROUND_Y)
+        nearby = heapq.nsmallest(NEAREST_ENEMIES, world.enemy_grid.query(view), key=lambda enemy: abs(enemy.rect.x - px))
+        for i in range(NEAREST_ENEMIES):
+            at = base + i * len(ENEMY_FIELDS)
+            if i < len(nearby):
+                enemy = nearby[i]
+                kind = 1.0 if enemy.kind == "waiter" else 2.0
+                out[at], out[at + 1], out[at + 2], out[at + 3], out[at + 4] = 1.0, enemy.rect.x - px, enemy.rect.y - py, kind, enemy.direction
+            else:
+                out[at] = out[at + 1] = out[at + 2] = out[at + 3] = out[at + 4] = 0.0
+
+        base += NEAREST_ENEMIES * len(ENEMY_FIELDS)
+        base = self.observe_projectiles(out, base, world.enemy_projectiles, NEAREST_BOTTLES, px, py)
+        self.observe_projectiles(out, base, world.projectiles, NEAREST_MUGS, px, py)
+
+    @staticmethod
+    def observe_projectiles(out, base: int, pool, count: int, px: int, py: int) -> int:
+        x, y, vx, vy = pool.x, pool.y, pool.vx, pool.vy
+        nearest = heapq.nsmallest(count, pool.live_slots(), key=lambda slot: abs(x[slot] - px))
+        for i in range(count):
+            at = base + i * len(PROJECTILE_FIELDS)
+            if i < len(nearest):
+                slot = nearest[i]
+                out[at], out[at + 1], out[at + 2], out[at + 3], out[at + 4] = 1.0, x[slot] - px, y[slot] - py, vx[slot], vy[slot]
+            else:
+                out[at] = out[at + 1] = out[at + 2] = out[at + 3] = out[at + 4] = 0.0
+        return base + count * len(PROJECTILE_FIELDS)
+
+
+def autopilot_policy(env: BavarianRunEnv) -> TickInput:
+    """The headless autopilot as a rollout policy."""
+    return autopilot(env.world)
+
+
+class SharedBuffers:
+    """Typed views over one shared-memory block: obs, rewards, actions and done flags for N envs."""
+
+    def __init__(self, count: int, name: str | None = None) -> None:
+        obs_bytes = 4 * OBS_SIZE * count
+        size = obs_bytes + 4 * count + 2 * count
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+        buf = self.shm.buf
+        self.slices = [buf[:obs_bytes], buf[obs_bytes:obs_bytes + 4 * count], buf[obs_bytes + 4 * count:obs_bytes + 5 * count], buf[obs_bytes + 5 * count:]]
+        self.obs = self.slices[0].cast("f")
+        self.rewards = self.slices[1].cast("f")
+        self.actions = self.slices[2].cast("b")
+        self.dones = self.slices[3].cast("B")
+
+    def release(self) -> None:
+        """Drop every view so the block can be closed; views handed out earlier become unusable."""
+        for view in (self.obs, self.rewards, self.actions, self.dones, *self.slices):
+            view.release()
+        self.shm.close()
+
+
+def worker(conn, shm_name: str, total: int, first: int, count: int, level: Level, seeds: list[int], tick_rate: int, max_steps: int) -> None:
+    """Own envs ``first .. first + count - 1`` and serve commands until "close"."""
+    buffers = SharedBuffers(total, shm_name)
+    envs = [BavarianRunEnv(level, seed, tick_rate, max_steps) for seed in seeds]
+    episodes = [0] * count
+
+    def write(index: int, env: BavarianRunEnv) -> None:
+        at = (first + index) * OBS_SIZE
+        buffers.obs[at:at + OBS_SIZE] = env.obs
+
+    def reseed(index: int) -> int:
+        episodes[index] += 1
+        return seeds[index] + episodes[index] * 7919
+
+    try:
+        while True:
+            command, arg = conn.recv()
+            if command == "reset":
+                for i, env in enumerate(envs):
+                    env.reset()
+                    write(i, env)
+                    buffers.dones[first + i] = 0
+                conn.send(None)
+            elif command == "step":
+                for i, env in enumerate(envs):
+                    _, reward, terminated, truncated, _ = env.step(int(buffers.actions[first + i]))
+                    buffers.rewards[first + i] = reward
+                    buffers.dones[first + i] = terminated or truncated
+                    if terminated or truncated:
+                        env.reset(reseed(i))
+                    write(i, env)
+                conn.send(None)
+            elif command == "rollout":
+                steps, policy = arg
+                stats = {"steps": 0, "episodes": 0, "wins": 0, "game_overs": 0, "score": 0}
+                for i, env in enumerate(envs):
+                    for _ in range(steps):
+                        _, _, terminated, truncated, info = env.step(policy(env))
+                        if terminated or truncated:
+                            stats["episodes"] += 1
+                            stats["wins"] += info["state"] == "win"
+                            stats["game_overs"] += info["state"] == "game_over"
+                            stats["score"] += info["score"]
+                            env.reset(reseed(i))
+                    stats["steps"] += steps
+                    write(i, env)
+                conn.send(stats)
+            elif command == "close":
+                break
+    finally:
+        buffers.release()
+        conn.close()
+
+
+class VectorEnv:
+    """N ``BavarianRunEnv`` instances across a process pool, auto-resetting finished episodes.
+
+    ``step(actions)`` takes one ``ACTIONS`` index per env and returns the
+    shared ``obs``, ``rewards`` and ``dones`` views, which the next call
+    overwrites. A done env has already been reset, and its observation row
+    is the first one of its next episode.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        level: Level | None = None,
+        seed: int = 0,
+        workers: int | None = None,
+        tick_rate: int = 60,
+        max_steps: int = DEFAULT_MAX_STEPS,
+    ) -> None:
+        level = level or load_level("default", GROUND_Y)
+        workers = max(1, min(count, workers or os.cpu_count() or 1))
+        self.count = count
+        self.buffers = SharedBuffers(count)
+        self.obs, self.rewards, self.actions, self.dones = self.buffers.obs, self.buffers.rewards, self.buffers.actions, self.buffers.dones
+        self.conns = []
+        self.processes = []
+        per_worker, extra = divmod(count, workers)
+        first = 0
+        for w in range(workers):
+            size = per_worker + (w < extra)
+            parent, child = multiprocessing.Pipe()
+            seeds = [seed + first + i for i in range(size)]
+            args = (child, self.buffers.shm.name, count, first, size, level, seeds, tick_rate, max_steps)
+            process = multiprocessing.Process(target=worker, args=args, daemon=True)
+            process.start()
+            child.close()
+            self.conns.append(parent)
+            self.processes.append(process)
+            first += size
+
+    def broadcast(self, command: str, arg=None) -> list:
+        for conn in self.conns:
+            conn.send((command, arg))
+        return [conn.recv() for conn in self.conns]
+
+    def reset(self) -> memoryview:
+        self.broadcast("reset")
+        return self.obs
+
+    def step(self, actions) -> tuple[memoryview, memoryview, memoryview]:
+        for i, action in enumerate(actions):
+            self.actions[i] = int(action)
+        self.broadcast("step")
+        return self.obs, self.rewards, self.dones
+
+    def rollout(self, steps: int, policy=autopilot_policy) -> dict:
+        """Run every env ``steps`` ticks under a module-level ``policy(env)`` inside the workers."""
+        totals: dict[str, int] = {}
+        for stats in self.broadcast("rollout", (steps, policy)):
+            for key, value in stats.items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def close(self) -> None:
+        for conn in self.conns:
+            conn.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self.buffers.release()
+        self.buffers.shm.unlink()
+
+    def __enter__(self) -> VectorEnv:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the autopilot across many environments and report throughput")
+    parser.add_argument("--envs", type=int, default=64, help="Number of environments")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--steps", type=int, default=20_000, help="Steps per environment")
+    parser.add_argument("--level", default="default", help="Level name in levels/, path to a level .json, or gen:SEED:LENGTH")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first environment; the rest count up")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    level = open_level(args.level)
+    with VectorEnv(args.envs, level, args.seed, args.workers) as vec:
+        vec.reset()
+        started = time.perf_counter()
+        stats = vec.rollout(args.steps)
+        elapsed = max(time.perf_counter() - started, 1e-9)
+    print(
+        f"{stats['steps']} steps over {args.envs} envs in {elapsed:.2f}s: {stats['steps'] / elapsed:.0f} steps/s, "
+        f"{stats['episodes']} episodes ({stats['wins']} wins, {stats['game_overs']} game overs)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Font lookup that avoids rescanning the system fonts on every launch.
+
+``pygame.font.SysFont`` builds its table of installed fonts (``fc-list`` on
+Linux) the first time it is called in a process, which dominates startup on
+a Pi. ``resolve_font`` does that lookup once per (family, bold) and keeps the
+resulting file path in a small JSON cache, so later launches open the font
+file directly. ``FontBook`` opens each named style on first use.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pygame
+
+
+FONT_CACHE = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "bavarian-mug-run" / "fonts.json"
+
+
+def cache_key(family: str, bold: bool) -> str:
+    return f"{family}:{'bold' if bold else 'regular'}"
+
+
+def read_cache(path: Path) -> dict[str, dict]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def resolve_font(family: str, bold: bool, cache: dict[str, dict]) -> tuple[str | None, bool]:
+    """Return (font file or None for pygame's default font, whether to embolden it).
+
+    Cached entries are trusted while their file still exists; a family that was
+    not installed stays on the default font until the cache is deleted. A miss
+    runs the system font scan and records the answer in ``cache``.
+    """
+    entry = cache.get(cache_key(family, bold))
+    if entry is not None and (entry["path"] is None or Path(entry["path"]).exists()):
+        return entry["path"], entry["fake_bold"]
+
+    path = pygame.font.match_font(family, bold=bold)
+    # match_font falls back to the regular face when there is no bold one;
+    # SysFont emboldens in that case and so do we.
+    fake_bold = bold and (path is None or path == pygame.font.match_font(family))
+    cache[cache_key(family, bold)] = {"path": path, "fake_bold": fake_bold}
+    return path, fake_bold
+
+
+class FontBook:
+    """Named font styles, each opened the first time it is asked for."""
+
+    def __init__(self, family: str, styles: dict[str, tuple[int, bool]], cache_path: Path = FONT_CACHE) -> None:
+        self.family = family
+        self.styles = styles
+        self.cache_path = cache_path
+        self.cache: dict[str, dict] | None = None
+        self.fonts: dict[str, pygame.font.Font] = {}
+        self.load_ms = 0.0
+
+    def get(self, style: str) -> pygame.font.Font:
+        font = self.fonts.get(style)
+        if font is None:
+            font = self.fonts[style] = self.open(*self.styles[style])
+        return font
+
+    def open(self, size: int, bold: bool) -> pygame.font.Font:
+        started = time.perf_counter()
+        if not pygame.font.get_init():
+            pygame.font.init()
+        if self.cache is None:
+            self.cache = read_cache(self.cache_path)
+        known = len(self.cache)
+        path, fake_bold = resolve_font(self.family, bold, self.cache)
+        if len(self.cache) != known:
+            self.save_cache()
+        font = pygame.font.Font(path, size)
+        font.set_bold(fake_bold)
+        self.load_ms += (time.perf_counter() - started) * 1000.0
+        return font
+
+    def save_cache(self) -> None:
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self.cache_path.write_text(json.dumps(self.cache, indent=2) + "\n", encoding="utf-8")
+        except OSError:
+            pass
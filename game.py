@@ -4,17 +4,31 @@
 from __future__ import annotations
 
 import argparse
+import bisect
+import json
 import math
 import random
+import struct
+import sys
+import time
+from array import array
+from collections import OrderedDict
 from dataclasses import dataclass
+from operator import attrgetter
 from pathlib import Path
 
 import pygame
 
+from fonts import FontBook
+from levelgen import JumpReach, load_generated, parse_spec
+from levels import ENEMY_KINDS, Level, chunk_index, load_level
+from painters import SPRITES, render
+from profiler import FrameProfiler, LatencyMeter, StartupTimer, percentile
+from replay import SEED_LIMIT, InputRecorder, InputReplay
+
 
 WIDTH = 960
 HEIGHT = 540
-WORLD_WIDTH = 6000
 GROUND_Y = 460
 GRAVITY = 2300
 PLAYER_SPEED = 340
@@ -22,121 +36,390 @@ JUMP_SPEED = -960
 MUG_SPEED = 680
 PLAYER_SHOOT_COOLDOWN = 0.35
 GOAL_BEERS = 8
+HEADLESS_ROUND_LIMIT_S = 240.0
+GRID_CELL_WIDTH = 256
+MOUNTAIN_PERIOD = 220
+TENT_PERIOD = 150
+TENT_TOP = 338
+TEXT_CACHE_SIZE = 64
+DIRTY_SCROLL_THRESHOLD = 2
+CHUNK_WIDTH = 1024
+CHUNK_MARGIN = WIDTH
+ENEMY_WAKE_RADIUS = WIDTH
+ENEMY_SLEEP_INTERVAL = 6
+COLLECTIBLE_MAX_WIDTH = 32
+PROFILE_OVERLAY_REFRESH = 30
+RENDER_SCALES = (1.0, 0.75, 0.5)
+TARGET_FPS = 60
+FRAME_BUDGET_MS = 1000.0 / TARGET_FPS
+MAX_FRAME_S = 0.25
+MAX_TICKS_PER_FRAME = 5
+IDLE_WAIT_MS = 1000
+GOVERNOR_WINDOW = 90
+GOVERNOR_STEP_DOWN = 0.9
+GOVERNOR_STEP_UP = 0.45
+FONT_FAMILY = "verdana"
+# style -> (point size, bold)
+FONT_STYLES = {"hud": (30, True), "small": (21, False), "large": (54, True), "tiny": (13, False)}
+LEFT_KEYS = (pygame.K_a, pygame.K_LEFT)
+RIGHT_KEYS = (pygame.K_d, pygame.K_RIGHT)
+JUMP_KEYS = (pygame.K_SPACE, pygame.K_UP, pygame.K_w)
+THROW_KEYS = (pygame.K_j, pygame.K_LCTRL, pygame.K_RETURN)
+JUMP_BUTTONS = (0,)
+THROW_BUTTONS = (1, 2, 5)
+AXIS_DEAD_ZONE = 0.2
+# Everything else (mouse, text input, window chatter) is dropped by SDL
+# before it reaches the queue.
+INPUT_EVENTS = (
+    pygame.QUIT,
+    pygame.KEYDOWN,
+    pygame.KEYUP,
+    pygame.JOYBUTTONDOWN,
+    pygame.JOYAXISMOTION,
+    pygame.JOYDEVICEADDED,
+    pygame.JOYDEVICEREMOVED,
+    pygame.WINDOWEXPOSED,
+    pygame.WINDOWFOCUSLOST,
+    pygame.VIDEOEXPOSE,
+)
+
+COLLECTIBLE_KINDS = ("beer", "pretzel")
+# Parked chunk records: collectible (kind, x, y, value, bob_seed) and
+# enemy (kind, direction, x, patrol_min, patrol_max, speed, throw_cooldown, hurt_timer).
+PARKED_ITEM = struct.Struct("<BiiHf")
+PARKED_ENEMY = struct.Struct("<Bbiiifff")
 
 ASSET_DIR = Path(__file__).resolve().parent / "assets" / "generated"
+ATLAS_IMAGE = ASSET_DIR / "atlas.png"
+ATLAS_INDEX = ASSET_DIR / "atlas.json"
+JUMP_REACH = JumpReach(JUMP_SPEED, GRAVITY, PLAYER_SPEED)
 
 
 def clamp(value: float, minimum: float, maximum: float) -> float:
     return max(minimum, min(value, maximum))
 
 
-def draw_player(surface: pygame.Surface) -> None:
-    surface.fill((0, 0, 0, 0))
-    pygame.draw.rect(surface, (43, 94, 188), (10, 20, 32, 30), border_radius=6)
-    pygame.draw.rect(surface, (245, 228, 202), (14, 4, 24, 20), border_radius=9)
-    pygame.draw.rect(surface, (210, 130, 70), (16, 10, 20, 8), border_radius=4)
-    pygame.draw.rect(surface, (245, 245, 245), (6, 22, 36, 8), border_radius=5)
-    pygame.draw.rect(surface, (82, 56, 38), (12, 50, 10, 12), border_radius=4)
-    pygame.draw.rect(surface, (82, 56, 38), (30, 50, 10, 12), border_radius=4)
-
-
-def draw_waiter(surface: pygame.Surface) -> None:
-    surface.fill((0, 0, 0, 0))
-    pygame.draw.rect(surface, (32, 32, 32), (10, 20, 32, 34), border_radius=6)
-    pygame.draw.rect(surface, (245, 232, 205), (14, 4, 24, 20), border_radius=9)
-    pygame.draw.rect(surface, (230, 230, 230), (6, 24, 36, 8), border_radius=5)
-    pygame.draw.rect(surface, (60, 60, 60), (7, 13, 34, 5), border_radius=3)
-    pygame.draw.rect(surface, (72, 72, 72), (12, 54, 10, 10), border_radius=3)
-    pygame.draw.rect(surface, (72, 72, 72), (30, 54, 10, 10), border_radius=3)
-    pygame.draw.rect(surface, (190, 190, 190), (40, 12, 11, 5), border_radius=3)
-
-
-def draw_police(surface: pygame.Surface) -> None:
-    surface.fill((0, 0, 0, 0))
-    pygame.draw.rect(surface, (28, 78, 166), (10, 20, 32, 34), border_radius=6)
-    pygame.draw.rect(surface, (245, 232, 205), (14, 4, 24, 20), border_radius=9)
-    pygame.draw.rect(surface, (18, 44, 110), (8, 11, 34, 6), border_radius=3)
-    pygame.draw.rect(surface, (225, 225, 225), (16, 28, 20, 5), border_radius=3)
-    pygame.draw.rect(surface, (26, 60, 130), (12, 54, 10, 10), border_radius=3)
-    pygame.draw.rect(surface, (26, 60, 130), (30, 54, 10, 10), border_radius=3)
-
-
-def draw_beer(surface: pygame.Surface) -> None:
-    surface.fill((0, 0, 0, 0))
-    pygame.draw.rect(surface, (252, 198, 71), (6, 8, 14, 24), border_radius=5)
-    pygame.draw.rect(surface, (255, 244, 207), (5, 2, 16, 10), border_radius=5)
-    pygame.draw.rect(surface, (238, 238, 238), (18, 12, 6, 12), border_radius=3)
-    pygame.draw.rect(surface, (255, 255, 255), (8, 11, 3, 15), border_radius=2)
-
-
-def draw_pretzel(surface: pygame.Surface) -> None:
-    surface.fill((0, 0, 0, 0))
-    pygame.draw.circle(surface, (177, 109, 56), (11, 12), 7, 5)
-    pygame.draw.circle(surface, (177, 109, 56), (21, 12), 7, 5)
-    pygame.draw.circle(surface, (177, 109, 56), (16, 21), 7, 5)
-    pygame.draw.circle(surface, (232, 202, 146), (16, 21), 1)
-
-
-def draw_mug(surface: pygame.Surface) -> None:
-    surface.fill((0, 0, 0, 0))
-    pygame.draw.rect(surface, (235, 235, 235), (5, 7, 16, 15), border_radius=4)
-    pygame.draw.rect(surface, (249, 200, 86), (7, 9, 12, 11), border_radius=3)
-    pygame.draw.rect(surface, (235, 235, 235), (18, 10, 5, 9), border_radius=3)
-
-
-def draw_stun(surface: pygame.Surface) -> None:
-    surface.fill((0, 0, 0, 0))
-    points = [(14, 1), (18, 10), (27, 10), (19, 16), (23, 26), (11, 17), (3, 17), (9, 10), (1, 10)]
-    pygame.draw.polygon(surface, (247, 212, 87), points)
-    pygame.draw.polygon(surface, (171, 129, 21), points, width=2)
-
-
-def fallback_image(size: tuple[int, int], painter) -> pygame.Surface:
-    img = pygame.Surface(size, pygame.SRCALPHA)
-    painter(img)
-    return img
-
-
-def load_asset(name: str, size: tuple[int, int], painter) -> pygame.Surface:
-    path = ASSET_DIR / f"{name}.png"
-    if path.exists():
-        loaded = pygame.image.load(path.as_posix()).convert_alpha()
-        return pygame.transform.smoothscale(loaded, size)
-    return fallback_image(size, painter)
-
-
-@dataclass
+def open_level(name: str) -> Level:
+    """Load a level file by name, or build a ``gen:SEED:LENGTH`` procedural one."""
+    spec = parse_spec(name)
+    if spec is None:
+        return load_level(name, GROUND_Y)
+    return load_generated(*spec, GROUND_Y, JUMP_REACH, GOAL_BEERS)
+
+
+def lerp(previous: float, current: float, alpha: float) -> float:
+    return current if alpha >= 1.0 else previous + (current - previous) * alpha
+
+
+def sweep_aabb(box: pygame.Rect, dx: float, dy: float, target: pygame.Rect) -> float:
+    """Fraction of the move (dx, dy) that ``box`` covers before touching ``target``.
+
+    Returns 0.0 when the boxes already overlap and ``math.inf`` when the move
+    never brings them into contact. Edges only touching at the end of the move
+    count as contact, so a box resting against a face and pushing into it
+    hits at 0.0.
+    """
+    if box.colliderect(target):
+        return 0.0
+    if dx > 0:
+        x_entry, x_exit = (target.left - box.right) / dx, (target.right - box.left) / dx
+    elif dx < 0:
+        x_entry, x_exit = (target.right - box.left) / dx, (target.left - box.right) / dx
+    elif box.right <= target.left or box.left >= target.right:
+        return math.inf
+    else:
+        x_entry, x_exit = -math.inf, math.inf
+    if dy > 0:
+        y_entry, y_exit = (target.top - box.bottom) / dy, (target.bottom - box.top) / dy
+    elif dy < 0:
+        y_entry, y_exit = (target.bottom - box.top) / dy, (target.top - box.bottom) / dy
+    elif box.bottom <= target.top or box.top >= target.bottom:
+        return math.inf
+    else:
+        y_entry, y_exit = -math.inf, math.inf
+    entry = max(x_entry, y_entry)
+    if entry >= min(x_exit, y_exit) or not 0.0 <= entry <= 1.0:
+        return math.inf
+    return entry
+
+
+def first_contact(box: pygame.Rect, dx: int, dy: int, candidates, rect_of=None) -> tuple[float, object]:
+    """Earliest (time of impact, candidate) as ``box`` moves by (dx, dy).
+
+    ``rect_of`` maps a candidate to its rect; by default candidates are rects.
+    Candidates off the swept path are rejected with one ``colliderect`` first.
+    """
+    path = box.union(box.move(dx, dy))
+    first, hit = math.inf, None
+    for candidate in candidates:
+        rect = candidate if rect_of is None else rect_of(candidate)
+        if not path.colliderect(rect):
+            continue
+        t = sweep_aabb(box, dx, dy, rect)
+        if t < first:
+            first, hit = t, candidate
+    return first, hit
+
+
+def load_atlas() -> dict[str, pygame.Surface]:
+    """Slice every sprite out of the generated atlas, painting any that is missing or the wrong size.
+
+    The sheet is converted to the display format once and each sprite is a
+    subsurface of it, so startup is one image read and no rescaling.
+    """
+    frames: dict[str, pygame.Surface] = {}
+    if ATLAS_IMAGE.exists() and ATLAS_INDEX.exists():
+        index = json.loads(ATLAS_INDEX.read_text(encoding="utf-8"))
+        sheet = pygame.image.load(ATLAS_IMAGE.as_posix()).convert_alpha()
+        bounds = sheet.get_rect()
+        for name, rect in index["sprites"].items():
+            if bounds.contains(rect):
+                frames[name] = sheet.subsurface(rect)
+
+    images = {}
+    for name, spec in SPRITES.items():
+        image = frames.get(name)
+        if image is None or image.get_size() != spec.size:
+            image = render(name).convert_alpha()
+        images[name] = image
+    return images
+
+
+# eq=False keeps identity equality: list.remove must find this exact item,
+# not the first one with equal fields, and without a per-field compare.
+@dataclass(eq=False)
 class Collectible:
+    # Declared by hand: dataclass(slots=True) needs Python 3.10.
+    __slots__ = ("kind", "rect", "value", "bob_seed")
+
     kind: str
     rect: pygame.Rect
     value: int
     bob_seed: float
-    taken: bool = False
 
 
-@dataclass
-class Projectile:
-    rect: pygame.Rect
-    velocity: pygame.Vector2
-    from_enemy: bool
+def collectible_x(item: Collectible) -> int:
+    return item.rect.x
 
 
-@dataclass
 class Enemy:
-    kind: str
-    rect: pygame.Rect
-    patrol_min: int
-    patrol_max: int
-    speed: float
-    direction: int = 1
-    throw_cooldown: float = 0.0
-    hurt_timer: float = 0.0
+    # A plain slotted class: defaults on a dataclass clash with hand-written
+    # __slots__, and dataclass(slots=True) needs Python 3.10.
+    __slots__ = (
+        "kind",
+        "rect",
+        "patrol_min",
+        "patrol_max",
+        "speed",
+        "direction",
+        "throw_cooldown",
+        "hurt_timer",
+        "sleep_dt",
+        "x",
+        "prev_x",
+    )
+
+    def __init__(
+        self,
+        kind: str,
+        rect: pygame.Rect,
+        patrol_min: int,
+        patrol_max: int,
+        speed: float,
+        direction: int = 1,
+        throw_cooldown: float = 0.0,
+        hurt_timer: float = 0.0,
+        sleep_dt: float = 0.0,
+    ) -> None:
+        self.kind = kind
+        self.rect = rect
+        self.patrol_min = patrol_min
+        self.patrol_max = patrol_max
+        self.speed = speed
+        self.direction = direction
+        self.throw_cooldown = throw_cooldown
+        self.hurt_timer = hurt_timer
+        self.sleep_dt = sleep_dt
+        # Sub-pixel position along the patrol and where the previous tick left it.
+        self.x = self.prev_x = float(rect.x)
+
+
+class SpatialHash:
+    """Uniform grid over world X, used as the broadphase for every collision query.
+
+    The level is a long horizontal strip, so cells are vertical slices of
+    ``cell_width`` pixels and a rect lands in every slice it overlaps.
+    """
+
+    def __init__(self, cell_width: int = GRID_CELL_WIDTH) -> None:
+        self.cell_width = cell_width
+        self.cells: dict[int, list] = {}
+        self.spans: dict[int, tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def span(self, rect: pygame.Rect) -> tuple[int, int]:
+        return rect.left // self.cell_width, (rect.right - 1) // self.cell_width
+
+    def insert(self, item, rect: pygame.Rect) -> None:
+        first, last = self.span(rect)
+        self.spans[id(item)] = (first, last)
+        for cell in range(first, last + 1):
+            self.cells.setdefault(cell, []).append(item)
+
+    def remove(self, item) -> None:
+        first, last = self.spans.pop(id(item))
+        for cell in range(first, last + 1):
+            bucket = self.cells[cell]
+            for index, other in enumerate(bucket):
+                if other is item:
+                    del bucket[index]
+                    break
+            if not bucket:
+                del self.cells[cell]
+
+    def move(self, item, rect: pygame.Rect) -> None:
+        if self.spans.get(id(item)) != self.span(rect):
+            self.remove(item)
+            self.insert(item, rect)
+
+    def query(self, rect: pygame.Rect) -> list:
+        """Return items whose cells overlap ``rect``, in insertion order per cell, without duplicates."""
+        first, last = self.span(rect)
+        if first == last:
+            return list(self.cells.get(first, ()))
+        found = []
+        seen: set[int] = set()
+        for cell in range(first, last + 1):
+            for item in self.cells.get(cell, ()):
+                if id(item) not in seen:
+                    seen.add(id(item))
+                    found.append(item)
+        return found
+
+
+class ProjectilePool:
+    """Projectiles of one size stored as parallel arrays, with free-list slot reuse.
+
+    A slot is an index into the position/velocity arrays; dead slots are
+    recycled by ``spawn``, so steady firing never allocates. Integration,
+    culling and overlap tests run as flat loops over the arrays.
+    """
+
+    def __init__(self, width: int, height: int, gravity: float, floor: float = math.inf) -> None:
+        self.width = width
+        self.height = height
+        self.gravity = gravity
+        self.floor = floor
+        self.x = array("d")
+        self.y = array("d")
+        self.px = array("d")
+        self.py = array("d")
+        self.vx = array("d")
+        self.vy = array("d")
+        self.alive = bytearray()
+        self.free: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.alive) - len(self.free)
+
+    def spawn(self, x: float, y: float, vx: float, vy: float) -> int:
+        if self.free:
+            slot = self.free.pop()
+            self.x[slot], self.y[slot], self.vx[slot], self.vy[slot] = x, y, vx, vy
+            self.px[slot], self.py[slot] = x, y
+            self.alive[slot] = 1
+            return slot
+        self.x.append(x)
+        self.y.append(y)
+        self.px.append(x)
+        self.py.append(y)
+        self.vx.append(vx)
+        self.vy.append(vy)
+        self.alive.append(1)
+        return len(self.alive) - 1
+
+    def kill(self, slot: int) -> None:
+        if self.alive[slot]:
+            self.alive[slot] = 0
+            self.free.append(slot)
+
+    def nbytes(self) -> int:
+        return sum(sys.getsizeof(values) for values in (self.x, self.y, self.px, self.py, self.vx, self.vy, self.alive))
+
+    def live_slots(self) -> list[int]:
+        if not len(self):
+            return []
+        alive = self.alive
+        return [slot for slot in range(len(alive)) if alive[slot]]
+
+    def rect(self, slot: int) -> pygame.Rect:
+        return pygame.Rect(int(self.x[slot]), int(self.y[slot]), self.width, self.height)
+
+    def path(self, slot: int) -> tuple[pygame.Rect, int, int]:
+        """The slot's box before the last step and the (dx, dy) that step moved it."""
+        start = pygame.Rect(int(self.px[slot]), int(self.py[slot]), self.width, self.height)
+        return start, int(self.x[slot]) - start.x, int(self.y[slot]) - start.y
+
+    def integrate(self, dt: float, world_width: int) -> None:
+        """Advance every live slot by ``dt`` and free the ones that left the world.
+
+        The arc is integrated exactly for constant gravity, so a shot follows
+        the same path at any tick rate. ``px``/``py`` keep each slot's
+        position from before the step for swept hits and render interpolation.
+        """
+        if not len(self):
+            return
+        x, y, vx, vy, alive = self.x, self.y, self.vx, self.vy, self.alive
+        px, py = self.px, self.py
+        pull = self.gravity * dt
+        bottom_limit = self.floor - self.height
+        right_limit = world_width - self.width
+        for slot in range(len(alive)):
+            if not alive[slot]:
+                continue
+            px[slot] = x[slot]
+            py[slot] = y[slot]
+            x[slot] += vx[slot] * dt
+            y[slot] += (vy[slot] + 0.5 * pull) * dt
+            vy[slot] += pull
+            if not (-self.width < x[slot] < right_limit and y[slot] < bottom_limit):
+                alive[slot] = 0
+                self.free.append(slot)
+
+    def sweeping(self, box: pygame.Rect, box_dx: int = 0, box_dy: int = 0) -> list[int]:
+        """Live slots whose last step touched ``box``, which itself just moved by (box_dx, box_dy).
+
+        The test runs in the box's frame of reference, so a fast shot cannot
+        pass through a box in one step, and neither can a box through a shot.
+        """
+        if not len(self):
+            return []
+        start_box = box.move(-box_dx, -box_dy)
+        reach = start_box.union(box)
+        left, right = reach.left - self.width, reach.right
+        top, bottom = reach.top - self.height, reach.bottom
+        x, y, px, py = self.x, self.y, self.px, self.py
+        hits = []
+        for slot in self.live_slots():
+            # Cheap reject on the swept extent before building any rects.
+            if max(x[slot], px[slot]) <= left or min(x[slot], px[slot]) >= right:
+                continue
+            if max(y[slot], py[slot]) <= top or min(y[slot], py[slot]) >= bottom:
+                continue
+            start, dx, dy = self.path(slot)
+            if sweep_aabb(start, dx - box_dx, dy - box_dy, start_box) <= 1.0:
+                hits.append(slot)
+        return hits
 
 
 class Player:
-    def __init__(self, spawn_x: int, spawn_y: int) -> None:
+    def __init__(self, spawn_x: int, spawn_y: int, world_width: int) -> None:
+        self.world_width = world_width
         self.rect = pygame.Rect(spawn_x, spawn_y, 46, 62)
         self.pos = pygame.Vector2(float(spawn_x), float(spawn_y))
+        self.prev = (spawn_x, spawn_y)
         self.vel = pygame.Vector2(0.0, 0.0)
         self.on_ground = False
         self.facing = 1
@@ -144,7 +427,8 @@ class Player:
         self.invuln_timer = 0.0
         self.lives = 3
 
-    def update(self, dt: float, solids: list[pygame.Rect], input_x: float, jump_pressed: bool) -> None:
+    def update(self, dt: float, solids: SpatialHash, input_x: float, jump_pressed: bool) -> None:
+        self.prev = self.rect.topleft
         self.shoot_cooldown = max(0.0, self.shoot_cooldown - dt)
         self.invuln_timer = max(0.0, self.invuln_timer - dt)
 
@@ -161,10 +445,29 @@ class Player:
         self.vel.y += GRAVITY * dt
         self.move_and_collide(dt, solids)
 
-    def move_and_collide(self, dt: float, solids: list[pygame.Rect]) -> None:
-        self.pos.x += self.vel.x * dt
+    def move_and_collide(self, dt: float, solids: SpatialHash) -> None:
+        """Move one axis at a time, stopping at the first solid face along each move.
+
+        Each axis move is swept, so a long step cannot carry the player through
+        a platform; the overlap pass after it only separates the player from
+        solids it already overlapped before moving. Both use one grid query
+        over the swept path.
+        """
+        target_x = self.pos.x + self.vel.x * dt
+        dx = int(target_x) - self.rect.x
+        nearby = solids.query(self.rect.union(self.rect.move(dx, 0)) if dx else self.rect)
+        if dx:
+            ahead = [solid for solid in nearby if not self.rect.colliderect(solid)]
+            _, solid = first_contact(self.rect, dx, 0, ahead)
+            if solid is not None:
+                if dx > 0:
+                    self.rect.right = solid.left
+                else:
+                    self.rect.left = solid.right
+                target_x = float(self.rect.x)
+        self.pos.x = target_x
         self.rect.x = int(self.pos.x)
-        for solid in solids:
+        for solid in nearby:
             if self.rect.colliderect(solid):
                 if self.vel.x > 0:
                     self.rect.right = solid.left
@@ -172,10 +475,24 @@ class Player:
                     self.rect.left = solid.right
                 self.pos.x = float(self.rect.x)
 
-        self.pos.y += self.vel.y * dt
-        self.rect.y = int(self.pos.y)
+        target_y = self.pos.y + self.vel.y * dt
+        dy = int(target_y) - self.rect.y
         self.on_ground = False
-        for solid in solids:
+        nearby = solids.query(self.rect.union(self.rect.move(0, dy)) if dy else self.rect)
+        if dy:
+            ahead = [solid for solid in nearby if not self.rect.colliderect(solid)]
+            _, solid = first_contact(self.rect, 0, dy, ahead)
+            if solid is not None:
+                if dy > 0:
+                    self.rect.bottom = solid.top
+                    self.on_ground = True
+                else:
+                    self.rect.top = solid.bottom
+                self.vel.y = 0
+                target_y = float(self.rect.y)
+        self.pos.y = target_y
+        self.rect.y = int(self.pos.y)
+        for solid in nearby:
             if self.rect.colliderect(solid):
                 if self.vel.y > 0:
                     self.rect.bottom = solid.top
@@ -188,19 +505,18 @@ class Player:
         if self.rect.left < 0:
             self.rect.left = 0
             self.pos.x = float(self.rect.x)
-        if self.rect.right > WORLD_WIDTH:
-            self.rect.right = WORLD_WIDTH
+        if self.rect.right > self.world_width:
+            self.rect.right = self.world_width
             self.pos.x = float(self.rect.x)
 
     def can_shoot(self) -> bool:
         return self.shoot_cooldown <= 0.0
 
-    def spawn_mug(self) -> Projectile:
+    def spawn_mug(self, mugs: ProjectilePool) -> None:
         self.shoot_cooldown = PLAYER_SHOOT_COOLDOWN
-        mug_rect = pygame.Rect(0, 0, 22, 22)
+        mug_rect = pygame.Rect(0, 0, mugs.width, mugs.height)
         mug_rect.center = (self.rect.centerx + self.facing * 22, self.rect.centery - 8)
-        velocity = pygame.Vector2(self.facing * MUG_SPEED, -120)
-        return Projectile(mug_rect, velocity, from_enemy=False)
+        mugs.spawn(mug_rect.x, mug_rect.y, self.facing * MUG_SPEED, -120)
 
     def take_hit(self, direction: int) -> None:
         if self.invuln_timer > 0:
@@ -211,372 +527,959 @@ class Player:
         self.vel.y = -480
 
 
-class BavarianRunGame:
-    def __init__(self, fullscreen: bool = False) -> None:
-        pygame.init()
-        pygame.display.set_caption("Bavarian Mug Run")
-        flags = pygame.FULLSCREEN if fullscreen else 0
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT), flags)
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont("verdana", 30, bold=True)
-        self.small_font = pygame.font.SysFont("verdana", 21)
-        self.large_font = pygame.font.SysFont("verdana", 54, bold=True)
-
-        self.assets = {
-            "player": load_asset("player", (46, 62), draw_player),
-            "waiter": load_asset("waiter", (50, 62), draw_waiter),
-            "police": load_asset("police", (50, 62), draw_police),
-            "beer": load_asset("beer", (26, 34), draw_beer),
-            "pretzel": load_asset("pretzel", (30, 30), draw_pretzel),
-            "mug": load_asset("mug", (22, 22), draw_mug),
-            "stun": load_asset("stun", (30, 30), draw_stun),
-        }
-
-        self.joystick = self._init_joystick()
-        self.running = True
+@dataclass
+class TickInput:
+    move_x: float = 0.0
+    jump: bool = False
+    throw: bool = False
+
+
+class World:
+    """Game simulation state and rules, with no display, font or asset dependencies."""
+
+    def __init__(self, level: Level | None = None, seed: int | None = None) -> None:
+        self.seed = random.randrange(2**32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.level = level or load_level("default", GROUND_Y)
+        self.world_width = self.level.width
+        self.chunk_count = -(-self.world_width // CHUNK_WIDTH)
+        self.level_chunks = chunk_index(self.level, CHUNK_WIDTH)
         self.time_s = 0.0
+        self.ticks = 0
         self.state = "menu"
-        self.fullscreen = fullscreen
-        self.jump_queued = False
+        self.profiler: FrameProfiler | None = None
         self.reset()
 
-    def _init_joystick(self) -> pygame.joystick.Joystick | None:
-        pygame.joystick.init()
-        if pygame.joystick.get_count() > 0:
-            js = pygame.joystick.Joystick(0)
-            js.init()
-            return js
-        return None
-
     def reset(self) -> None:
-        self.solids = self.build_solids()
-        self.collectibles = self.build_collectibles()
-        self.enemies = self.build_enemies()
-        self.player = Player(80, GROUND_Y - 62)
-        self.projectiles: list[Projectile] = []
-        self.enemy_projectiles: list[Projectile] = []
+        self.solids: list[pygame.Rect] = []
+        self.collectibles: list[Collectible] = []
+        self.collectible_xs: list[int] = []
+        self.enemies: list[Enemy] = []
+        self.solid_grid = SpatialHash()
+        self.collectible_grid = SpatialHash()
+        self.enemy_grid = SpatialHash()
+        self.active_chunks: set[int] = set()
+        self.visited_chunks: set[int] = set()
+        # chunk -> (its ground slice, the platform indices it overlaps); a
+        # platform spanning several chunks is live while any of them is.
+        self.chunk_solids: dict[int, tuple[pygame.Rect, array]] = {}
+        self.platform_rects: dict[int, pygame.Rect] = {}
+        self.platform_refs: dict[int, int] = {}
+        self.chunk_items: dict[int, list[Collectible]] = {}
+        self.parked_items: dict[int, bytes] = {}
+        self.parked_enemies: dict[int, bytearray] = {}
+        self.player = Player(80, GROUND_Y - 62, self.world_width)
+        self.projectiles = ProjectilePool(22, 22, GRAVITY * 0.45, floor=GROUND_Y + 10)
+        self.enemy_projectiles = ProjectilePool(14, 14, 0.0)
         self.score = 0
         self.beers = 0
         self.pretzels = 0
         self.camera_x = 0.0
+        self.prev_camera_x = 0.0
         self.message = "Collect beer and pretzels. Reach the festival gate!"
         self.message_timer = 6.0
+        self.stream_chunks()
+
+    def start(self) -> None:
+        self.state = "running"
+        self.reset()
+
+    def chunk_of(self, x: int) -> int:
+        """Chunk holding world x; anything past either end of the level belongs to the edge chunk."""
+        return min(max(x // CHUNK_WIDTH, 0), self.chunk_count - 1)
+
+    def build_ground(self, chunk: int) -> pygame.Rect:
+        left = chunk * CHUNK_WIDTH
+        return pygame.Rect(left, GROUND_Y, min(CHUNK_WIDTH, self.world_width - left), HEIGHT - GROUND_Y)
+
+    def build_platform(self, index: int) -> pygame.Rect:
+        return pygame.Rect(self.level.platforms[4 * index:4 * index + 4])
 
-    def build_solids(self) -> list[pygame.Rect]:
-        solids = [pygame.Rect(0, GROUND_Y, WORLD_WIDTH, HEIGHT - GROUND_Y)]
-        platform_specs = [
-            (320, 390, 170, 22),
-            (760, 350, 220, 22),
-            (1220, 402, 160, 22),
-            (1580, 338, 190, 22),
-            (2020, 372, 200, 22),
-            (2480, 326, 180, 22),
-            (2880, 402, 220, 22),
-            (3380, 348, 190, 22),
-            (3800, 382, 200, 22),
-            (4280, 328, 210, 22),
-            (4740, 368, 210, 22),
-            (5230, 330, 180, 22),
-        ]
-        for x, y, w, h in platform_specs:
-            solids.append(pygame.Rect(x, y, w, h))
-        return solids
-
-    def build_collectibles(self) -> list[Collectible]:
+    def build_collectibles(self, chunk: int) -> list[Collectible]:
         items: list[Collectible] = []
-        for x in range(240, WORLD_WIDTH - 200, 220):
-            kind = "beer" if random.random() < 0.6 else "pretzel"
+        spawns = self.level.spawns
+        odds = self.level.spawn_odds
+        for i in self.level_chunks.get(chunk, ((), (), ()))[1]:
+            chance, beer_chance = odds[2 * i], odds[2 * i + 1]
+            if chance < 1.0 and self.rng.random() >= chance:
+                continue
+            x, surface_y, beer_lift, pretzel_lift = spawns[4 * i:4 * i + 4]
+            kind = "beer" if self.rng.random() < beer_chance else "pretzel"
             value = 30 if kind == "beer" else 20
-            y = GROUND_Y - (44 if kind == "beer" else 40)
-            items.append(Collectible(kind, pygame.Rect(x, y, 28, 36), value, random.random() * 10))
-
-        for solid in self.solids[1:]:
-            if random.random() < 0.75:
-                cx = solid.centerx - 12
-                kind = "beer" if random.random() < 0.65 else "pretzel"
-                value = 30 if kind == "beer" else 20
-                y = solid.top - (40 if kind == "beer" else 34)
-                items.append(Collectible(kind, pygame.Rect(cx, y, 28, 36), value, random.random() * 10))
+            y = surface_y - (beer_lift if kind == "beer" else pretzel_lift)
+            items.append(Collectible(kind, pygame.Rect(x, y, 28, 36), value, self.rng.random() * 10))
         return items
 
-    def build_enemies(self) -> list[Enemy]:
-        return [
-            Enemy("waiter", pygame.Rect(560, GROUND_Y - 62, 50, 62), 500, 910, 95),
-            Enemy("police", pygame.Rect(1360, GROUND_Y - 62, 50, 62), 1260, 1610, 85),
-            Enemy("waiter", pygame.Rect(2200, GROUND_Y - 62, 50, 62), 2100, 2480, 100),
-            Enemy("police", pygame.Rect(3120, GROUND_Y - 62, 50, 62), 3000, 3360, 92),
-            Enemy("waiter", pygame.Rect(4050, GROUND_Y - 62, 50, 62), 3940, 4320, 104),
-            Enemy("police", pygame.Rect(4950, GROUND_Y - 62, 50, 62), 4800, 5300, 100),
-        ]
+    def build_enemies(self, chunk: int) -> list[Enemy]:
+        enemies: list[Enemy] = []
+        records = self.level.enemies
+        speeds = self.level.enemy_speeds
+        for i in self.level_chunks.get(chunk, ((), (), ()))[2]:
+            kind, x, patrol_min, patrol_max = records[4 * i:4 * i + 4]
+            enemies.append(Enemy(ENEMY_KINDS[kind], pygame.Rect(x, GROUND_Y - 62, 50, 62), patrol_min, patrol_max, speeds[i]))
+        return enemies
+
+    def stream_chunks(self) -> None:
+        """Keep only chunks within CHUNK_MARGIN of the view live; park the rest as packed records."""
+        first = max(0, int(self.camera_x - CHUNK_MARGIN) // CHUNK_WIDTH)
+        last = min(self.chunk_count - 1, int(self.camera_x + WIDTH + CHUNK_MARGIN) // CHUNK_WIDTH)
+        wanted = set(range(first, last + 1))
+        if wanted == self.active_chunks:
+            return
 
-    def toggle_fullscreen(self) -> None:
-        self.fullscreen = not self.fullscreen
-        flags = pygame.FULLSCREEN if self.fullscreen else 0
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT), flags)
+        for chunk in self.active_chunks - wanted:
+            self.park_chunk(chunk)
+        roaming: list[Enemy] = []
+        for enemy in self.enemies:
+            chunk = self.chunk_of(enemy.rect.x)
+            if chunk in wanted:
+                roaming.append(enemy)
+            else:
+                self.park_enemy(enemy, chunk)
+        self.enemies = roaming
+        for chunk in sorted(wanted - self.active_chunks):
+            self.activate_chunk(chunk)
+
+        self.active_chunks = wanted
+        ordered = sorted(wanted)
+        self.solids = list(self.platform_rects.values())
+        self.collectibles = sorted((item for chunk in ordered for item in self.chunk_items[chunk]), key=collectible_x)
+        self.collectible_xs = [item.rect.x for item in self.collectibles]
+
+    def activate_chunk(self, chunk: int) -> None:
+        ground = self.build_ground(chunk)
+        self.solid_grid.insert(ground, ground)
+        platforms = self.level_chunks.get(chunk, ((), (), ()))[0]
+        for i in platforms:
+            if i in self.platform_refs:
+                self.platform_refs[i] += 1
+                continue
+            rect = self.platform_rects[i] = self.build_platform(i)
+            self.platform_refs[i] = 1
+            self.solid_grid.insert(rect, rect)
+        self.chunk_solids[chunk] = (ground, platforms)
+
+        if chunk in self.visited_chunks:
+            items = [
+                Collectible(COLLECTIBLE_KINDS[kind], pygame.Rect(x, y, 28, 36), value, bob_seed)
+                for kind, x, y, value, bob_seed in PARKED_ITEM.iter_unpack(self.parked_items.pop(chunk))
+            ]
+            enemies: list[Enemy] = []
+        else:
+            self.visited_chunks.add(chunk)
+            items = self.build_collectibles(chunk)
+            enemies = self.build_enemies(chunk)
+        for item in items:
+            self.collectible_grid.insert(item, item.rect)
+        self.chunk_items[chunk] = items
+
+        for kind, direction, x, patrol_min, patrol_max, speed, throw_cooldown, hurt_timer in PARKED_ENEMY.iter_unpack(
+            self.parked_enemies.pop(chunk, b"")
+        ):
+            rect = pygame.Rect(x, GROUND_Y - 62, 50, 62)
+            enemies.append(Enemy(ENEMY_KINDS[kind], rect, patrol_min, patrol_max, speed, direction, throw_cooldown, hurt_timer))
+        for enemy in enemies:
+            self.enemy_grid.insert(enemy, enemy.rect)
+        self.enemies.extend(enemies)
+
+    def park_chunk(self, chunk: int) -> None:
+        ground, platforms = self.chunk_solids.pop(chunk)
+        self.solid_grid.remove(ground)
+        for i in platforms:
+            self.platform_refs[i] -= 1
+            if not self.platform_refs[i]:
+                del self.platform_refs[i]
+                self.solid_grid.remove(self.platform_rects.pop(i))
+        records = bytearray()
+        for item in self.chunk_items.pop(chunk):
+            self.collectible_grid.remove(item)
+            kind = COLLECTIBLE_KINDS.index(item.kind)
+            records += PARKED_ITEM.pack(kind, item.rect.x, item.rect.y, item.value, item.bob_seed)
+        self.parked_items[chunk] = bytes(records)
+
+    def park_enemy(self, enemy: Enemy, chunk: int) -> None:
+        self.enemy_grid.remove(enemy)
+        record = PARKED_ENEMY.pack(
+            ENEMY_KINDS.index(enemy.kind),
+            enemy.direction,
+            enemy.rect.x,
+            enemy.patrol_min,
+            enemy.patrol_max,
+            enemy.speed,
+            enemy.throw_cooldown,
+            enemy.hurt_timer,
+        )
+        self.parked_enemies.setdefault(chunk, bytearray()).extend(record)
+
+    def memory_report(self) -> dict[str, dict[str, int]]:
+        """Entity counts and their approximate bytes, live objects and parked records apart.
+
+        Live sizes cover each object and its rect, not the shared kind
+        strings; parked sizes are the packed record buffers.
+        """
+        def live(items: list) -> dict[str, int]:
+            size = sum(sys.getsizeof(item) + sys.getsizeof(item.rect) for item in items)
+            return {"count": len(items), "bytes": size}
+
+        parked_items = sum(len(records) for records in self.parked_items.values())
+        parked_enemies = sum(len(records) for records in self.parked_enemies.values())
+        pools = (self.projectiles, self.enemy_projectiles)
+        return {
+            "collectibles": live(self.collectibles),
+            "parked_collectibles": {"count": parked_items // PARKED_ITEM.size, "bytes": parked_items},
+            "enemies": live(self.enemies),
+            "parked_enemies": {"count": parked_enemies // PARKED_ENEMY.size, "bytes": parked_enemies},
+            "projectiles": {"count": sum(len(pool) for pool in pools), "bytes": sum(pool.nbytes() for pool in pools)},
+            "solids": {"count": len(self.solid_grid), "bytes": len(self.solid_grid) * sys.getsizeof(self.player.rect)},
+        }
 
-    def handle_event(self, event: pygame.event.Event) -> None:
-        if event.type == pygame.QUIT:
-            self.running = False
-            return
+    def summary(self) -> str:
+        return (
+            f"tick {self.ticks} state {self.state} score {self.score} beers {self.beers} pretzels {self.pretzels} "
+            f"lives {self.player.lives} player ({self.player.pos.x:.3f}, {self.player.pos.y:.3f})"
+        )
 
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
-                self.running = False
-            elif event.key == pygame.K_F11:
-                self.toggle_fullscreen()
-            elif event.key in (pygame.K_SPACE, pygame.K_UP, pygame.K_w):
-                if self.state == "running":
-                    self.jump_queued = True
-                elif self.state in ("menu", "game_over", "win"):
-                    self.state = "running"
-                    self.reset()
-            elif event.key in (pygame.K_j, pygame.K_LCTRL, pygame.K_RETURN):
-                if self.state == "running" and self.player.can_shoot():
-                    self.projectiles.append(self.player.spawn_mug())
-                elif self.state in ("menu", "game_over", "win"):
-                    self.state = "running"
-                    self.reset()
+    def throw_mug(self) -> None:
+        if self.player.can_shoot():
+            self.player.spawn_mug(self.projectiles)
 
-        if event.type == pygame.JOYBUTTONDOWN:
-            if event.button == 0:
-                if self.state == "running":
-                    self.jump_queued = True
-                elif self.state in ("menu", "game_over", "win"):
-                    self.state = "running"
-                    self.reset()
-            if event.button in (1, 2, 5) and self.state == "running" and self.player.can_shoot():
-                self.projectiles.append(self.player.spawn_mug())
-
-    def update(self, dt: float) -> None:
+    def update(self, dt: float, controls: TickInput) -> None:
         self.time_s += dt
+        self.ticks += 1
         self.message_timer = max(0.0, self.message_timer - dt)
 
         if self.state != "running":
+            if controls.jump or controls.throw:
+                self.start()
             return
 
-        keys = pygame.key.get_pressed()
-        move_x = 0.0
-        if keys[pygame.K_a] or keys[pygame.K_LEFT]:
-            move_x -= 1.0
-        if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
-            move_x += 1.0
-
-        if self.joystick:
-            axis = self.joystick.get_axis(0)
-            if abs(axis) > 0.2:
-                move_x = clamp(axis, -1.0, 1.0)
-
-        self.player.update(dt, self.solids, move_x, self.jump_queued)
-        self.jump_queued = False
+        prof = self.profiler
+        if prof:
+            prof.begin()
+        if controls.throw:
+            self.throw_mug()
+        self.player.update(dt, self.solid_grid, controls.move_x, controls.jump)
+        if prof:
+            prof.lap("Player.update")
 
         self.update_collectibles()
+        if prof:
+            prof.lap("update_collectibles")
         self.update_projectiles(dt)
+        if prof:
+            prof.lap("update_projectiles")
         self.update_enemies(dt)
+        if prof:
+            prof.lap("update_enemies")
         self.check_goal_state()
+        if prof:
+            prof.lap("check_goal_state")
         self.update_camera(dt)
+        if prof:
+            prof.lap("update_camera")
+        self.stream_chunks()
+        if prof:
+            prof.lap("stream_chunks")
 
         if self.player.rect.top > HEIGHT + 120:
             self.player.take_hit(-1)
             self.player.rect.topleft = (max(40, self.player.rect.x - 120), GROUND_Y - self.player.rect.height)
             self.player.pos = pygame.Vector2(self.player.rect.x, self.player.rect.y)
+            self.player.prev = self.player.rect.topleft
 
         if self.player.lives <= 0:
             self.state = "game_over"
 
     def update_collectibles(self) -> None:
-        for item in self.collectibles:
-            if item.taken:
-                continue
+        for item in self.collectible_grid.query(self.player.rect):
             if self.player.rect.colliderect(item.rect):
-                item.taken = True
+                self.take_collectible(item)
                 self.score += item.value
                 if item.kind == "beer":
                     self.beers += 1
                 else:
                     self.pretzels += 1
 
-    def update_projectiles(self, dt: float) -> None:
-        for shot in self.projectiles:
-            shot.velocity.y += GRAVITY * 0.45 * dt
-            shot.rect.x += int(shot.velocity.x * dt)
-            shot.rect.y += int(shot.velocity.y * dt)
-
-        for shot in self.enemy_projectiles:
-            shot.rect.x += int(shot.velocity.x * dt)
-            shot.rect.y += int(shot.velocity.y * dt)
-
-        self.projectiles = [s for s in self.projectiles if 0 < s.rect.right < WORLD_WIDTH and s.rect.bottom < GROUND_Y + 10]
-        self.enemy_projectiles = [s for s in self.enemy_projectiles if 0 < s.rect.right < WORLD_WIDTH]
-
-        remaining_enemies: list[Enemy] = []
-        for enemy in self.enemies:
-            defeated = False
-            for shot in self.projectiles:
-                if enemy.rect.colliderect(shot.rect):
-                    defeated = True
-                    shot.rect.x = -500
-                    self.score += 60
-                    break
-            if not defeated:
-                remaining_enemies.append(enemy)
-        self.enemies = remaining_enemies
+    def take_collectible(self, item: Collectible) -> None:
+        """Drop a picked-up item from the grid, its chunk and the draw order right away."""
+        self.collectible_grid.remove(item)
+        self.chunk_items[self.chunk_of(item.rect.x)].remove(item)
+        index = bisect.bisect_left(self.collectible_xs, item.rect.x)
+        while self.collectibles[index] is not item:
+            index += 1
+        del self.collectibles[index]
+        del self.collectible_xs[index]
 
-        for shot in self.enemy_projectiles:
-            if self.player.rect.colliderect(shot.rect):
-                direction = -1 if shot.velocity.x > 0 else 1
-                self.player.take_hit(direction)
-                shot.rect.x = -1000
-
-        self.projectiles = [s for s in self.projectiles if s.rect.x > -50]
-        self.enemy_projectiles = [s for s in self.enemy_projectiles if s.rect.x > -900]
+    def update_projectiles(self, dt: float) -> None:
+        mugs = self.projectiles
+        bottles = self.enemy_projectiles
+        mugs.integrate(dt, self.world_width)
+        bottles.integrate(dt, self.world_width)
+
+        # Enemies move after projectiles, so they stand still during this
+        # step and each mug is swept along its own path; the first enemy it
+        # reaches takes the hit.
+        defeated: list[Enemy] = []
+        rect_of = attrgetter("rect")
+        x, y, px, py = mugs.x, mugs.y, mugs.px, mugs.py
+        for slot in mugs.live_slots():
+            x0, y0, x1, y1 = int(px[slot]), int(py[slot]), int(x[slot]), int(y[slot])
+            path = pygame.Rect(min(x0, x1), min(y0, y1), abs(x1 - x0) + mugs.width, abs(y1 - y0) + mugs.height)
+            nearby = self.enemy_grid.query(path)
+            if not nearby:
+                continue
+            start = pygame.Rect(x0, y0, mugs.width, mugs.height)
+            _, enemy = first_contact(start, x1 - x0, y1 - y0, nearby, rect_of)
+            if enemy is not None:
+                self.enemy_grid.remove(enemy)
+                defeated.append(enemy)
+                mugs.kill(slot)
+                self.score += 60
+        if defeated:
+            self.enemies = [enemy for enemy in self.enemies if all(enemy is not hit for hit in defeated)]
+
+        player = self.player
+        moved_x = player.rect.x - player.prev[0]
+        moved_y = player.rect.y - player.prev[1]
+        for slot in bottles.sweeping(player.rect, moved_x, moved_y):
+            direction = -1 if bottles.vx[slot] > 0 else 1
+            self.player.take_hit(direction)
+            bottles.kill(slot)
 
     def update_enemies(self, dt: float) -> None:
+        """Tick enemies near the player every frame; distant ones sleep and catch up periodically.
+
+        A sleeper banks its elapsed time and takes one combined step every
+        ENEMY_SLEEP_INTERVAL ticks, staggered by patrol start. Chasing,
+        throwing and contact all need the player well inside
+        ENEMY_WAKE_RADIUS, so a sleeper only ever patrols.
+        """
+        player_x = self.player.rect.centerx
         for enemy in self.enemies:
-            enemy.throw_cooldown = max(0.0, enemy.throw_cooldown - dt)
-            enemy.hurt_timer = max(0.0, enemy.hurt_timer - dt)
-
-            speed = enemy.speed
-            dist_to_player = self.player.rect.centerx - enemy.rect.centerx
-            if enemy.kind == "waiter" and abs(dist_to_player) < 190:
-                enemy.direction = 1 if dist_to_player > 0 else -1
-                speed *= 1.75
-
-            enemy.rect.x += int(enemy.direction * speed * dt)
-
-            if enemy.rect.left <= enemy.patrol_min:
-                enemy.rect.left = enemy.patrol_min
-                enemy.direction = 1
-            elif enemy.rect.right >= enemy.patrol_max:
-                enemy.rect.right = enemy.patrol_max
-                enemy.direction = -1
-
-            if enemy.kind == "police" and abs(dist_to_player) < 430 and enemy.throw_cooldown <= 0:
-                enemy.throw_cooldown = 1.7
-                direction = 1 if dist_to_player > 0 else -1
-                bottle = Projectile(
-                    rect=pygame.Rect(enemy.rect.centerx - 7, enemy.rect.centery - 16, 14, 14),
-                    velocity=pygame.Vector2(direction * 420, 0),
-                    from_enemy=True,
-                )
-                self.enemy_projectiles.append(bottle)
-
-            if enemy.rect.colliderect(self.player.rect.inflate(-10, -6)):
-                direction = -1 if self.player.rect.centerx > enemy.rect.centerx else 1
-                self.player.take_hit(direction)
+            enemy.sleep_dt += dt
+            asleep = abs(enemy.rect.centerx - player_x) > ENEMY_WAKE_RADIUS
+            if asleep and (self.ticks + enemy.patrol_min) % ENEMY_SLEEP_INTERVAL:
+                continue
+            step = enemy.sleep_dt
+            enemy.sleep_dt = 0.0
+            self.update_enemy(enemy, step)
+
+    def update_enemy(self, enemy: Enemy, dt: float) -> None:
+        enemy.throw_cooldown = max(0.0, enemy.throw_cooldown - dt)
+        enemy.hurt_timer = max(0.0, enemy.hurt_timer - dt)
+
+        speed = enemy.speed
+        dist_to_player = self.player.rect.centerx - enemy.rect.centerx
+        if enemy.kind == "waiter" and abs(dist_to_player) < 190:
+            enemy.direction = 1 if dist_to_player > 0 else -1
+            speed *= 1.75
+
+        enemy.prev_x = enemy.x
+        enemy.x += enemy.direction * speed * dt
+        enemy.rect.x = int(enemy.x)
+
+        if enemy.rect.left <= enemy.patrol_min:
+            enemy.rect.left = enemy.patrol_min
+            enemy.x = float(enemy.rect.x)
+            enemy.direction = 1
+        elif enemy.rect.right >= enemy.patrol_max:
+            enemy.rect.right = enemy.patrol_max
+            enemy.x = float(enemy.rect.x)
+            enemy.direction = -1
+        self.enemy_grid.move(enemy, enemy.rect)
+
+        if enemy.kind == "police" and abs(dist_to_player) < 430 and enemy.throw_cooldown <= 0:
+            enemy.throw_cooldown = 1.7
+            direction = 1 if dist_to_player > 0 else -1
+            self.enemy_projectiles.spawn(enemy.rect.centerx - 7, enemy.rect.centery - 16, direction * 420, 0.0)
+
+        if enemy.rect.colliderect(self.player.rect.inflate(-10, -6)):
+            direction = -1 if self.player.rect.centerx > enemy.rect.centerx else 1
+            self.player.take_hit(direction)
 
     def check_goal_state(self) -> None:
-        if self.player.rect.right >= WORLD_WIDTH - 50:
+        if self.player.rect.right >= self.world_width - 50:
             if self.beers >= GOAL_BEERS:
                 self.state = "win"
             else:
                 missing = GOAL_BEERS - self.beers
                 self.message = f"You need {missing} more beer(s) to enter Oktoberfest!"
                 self.message_timer = 2.3
-                self.player.rect.right = WORLD_WIDTH - 54
+                self.player.rect.right = self.world_width - 54
                 self.player.pos.x = float(self.player.rect.x)
 
     def update_camera(self, dt: float) -> None:
         target = self.player.rect.centerx - WIDTH * 0.42
-        target = clamp(target, 0, WORLD_WIDTH - WIDTH)
+        target = clamp(target, 0, self.world_width - WIDTH)
+        self.prev_camera_x = self.camera_x
         self.camera_x += (target - self.camera_x) * min(1.0, dt * 8)
 
+
+def scale_surface(surface: pygame.Surface, scale: float) -> pygame.Surface:
+    width, height = surface.get_size()
+    return pygame.transform.smoothscale(surface, (max(1, round(width * scale)), max(1, round(height * scale))))
+
+
+class SpriteCache:
+    """Loaded sprites plus precomputed variants, keyed by name.
+
+    The mirrored orientation and other variants (scaled, tinted) are built
+    once on first request and kept, so draw code never transforms surfaces
+    per frame and sprites that never face left or never appear cost nothing.
+    """
+
+    def __init__(self) -> None:
+        self.surfaces: dict[tuple[str, object], pygame.Surface] = {}
+
+    def add(self, name: str, image: pygame.Surface) -> None:
+        self.surfaces[(name, 1)] = image
+
+    def get(self, name: str, facing: int = 1) -> pygame.Surface:
+        surface = self.surfaces.get((name, facing))
+        if surface is None:
+            surface = pygame.transform.flip(self.surfaces[(name, 1)], True, False)
+            self.surfaces[(name, facing)] = surface
+        return surface
+
+    def scaled(self, name: str, facing: int, scale: float) -> pygame.Surface:
+        key = (name, (facing, scale))
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = scale_surface(self.get(name, facing), scale)
+            self.surfaces[key] = surface
+        return surface
+
+    def variant(self, name: str, tag: object, build) -> pygame.Surface:
+        key = (name, tag)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = build(self.surfaces[(name, 1)])
+            self.surfaces[key] = surface
+        return surface
+
+
+class TextCache:
+    """Rendered text surfaces keyed by (font, text, colour) with LRU eviction."""
+
+    def __init__(self, capacity: int = TEXT_CACHE_SIZE) -> None:
+        self.capacity = capacity
+        self.entries: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+
+    def render(self, font: pygame.font.Font, text: str, colour: tuple[int, int, int]) -> pygame.Surface:
+        key = (font, text, colour)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            return surface
+        surface = font.render(text, True, colour)
+        self.entries[key] = surface
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+        return surface
+
+
+class ParallaxBackground:
+    """Sky, mountain and tent layers pre-rendered into wrap-around strips.
+
+    Both layers repeat with a fixed period, so a strip one period plus one
+    screen wide covers every scroll offset and each frame costs two blits.
+    The strips are rebuilt only when the target surface changes size; a
+    target smaller than the screen gets full-size strips scaled down to it.
+    """
+
+    def __init__(self) -> None:
+        self.size: tuple[int, int] | None = None
+        self.scale = 1.0
+        self.sky_strip: pygame.Surface | None = None
+        self.tent_strip: pygame.Surface | None = None
+
+    def invalidate(self) -> None:
+        self.size = None
+
+    def bake(self, size: tuple[int, int]) -> None:
+        scale = size[1] / HEIGHT
+        width, height = (size[0], size[1]) if scale == 1.0 else (WIDTH, HEIGHT)
+        sky = pygame.Surface((width + MOUNTAIN_PERIOD, height)).convert()
+        sky.fill((125, 198, 245))
+        pygame.draw.rect(sky, (94, 178, 233), (0, 0, sky.get_width(), 160))
+        for i in range(-1, sky.get_width() // MOUNTAIN_PERIOD + 2):
+            x = i * MOUNTAIN_PERIOD
+            pygame.draw.polygon(sky, (100, 129, 152), [(x, 290), (x + 100, 180), (x + 200, 290)])
+            pygame.draw.polygon(sky, (131, 164, 188), [(x + 20, 290), (x + 105, 200), (x + 190, 290)])
+
+        key = (255, 0, 255)
+        tents = pygame.Surface((width + TENT_PERIOD, GROUND_Y - TENT_TOP)).convert()
+        tents.fill(key)
+        tents.set_colorkey(key, pygame.RLEACCEL)
+        base = GROUND_Y - TENT_TOP
+        for i in range(-1, tents.get_width() // TENT_PERIOD + 2):
+            x = i * TENT_PERIOD
+            pygame.draw.polygon(tents, (248, 237, 214), [(x + 10, base), (x + 70, 0), (x + 130, base)])
+            pygame.draw.rect(tents, (220, 71, 54), (x + 14, 395 - TENT_TOP, 112, 12))
+            pygame.draw.rect(tents, (241, 230, 205), (x + 34, 410 - TENT_TOP, 72, 50))
+
+        if scale != 1.0:
+            sky = scale_surface(sky, scale)
+            # Nearest-neighbour keeps the colour key from bleeding into edges.
+            tents = pygame.transform.scale(tents, (round(tents.get_width() * scale), round(tents.get_height() * scale)))
+            tents.set_colorkey(key, pygame.RLEACCEL)
+
+        self.sky_strip = sky
+        self.tent_strip = tents
+        self.size = size
+        self.scale = scale
+
+    def draw(self, surface: pygame.Surface, camera_x: float) -> None:
+        if surface.get_size() != self.size:
+            self.bake(surface.get_size())
+        scale = self.scale
+        if scale == 1.0:
+            surface.blit(self.sky_strip, (-(int(camera_x * 0.18) % MOUNTAIN_PERIOD), 0))
+            surface.blit(self.tent_strip, (-(int(camera_x * 0.42) % TENT_PERIOD), TENT_TOP))
+        else:
+            surface.blit(self.sky_strip, (-int((int(camera_x * 0.18) % MOUNTAIN_PERIOD) * scale), 0))
+            surface.blit(self.tent_strip, (-int((int(camera_x * 0.42) % TENT_PERIOD) * scale), int(TENT_TOP * scale)))
+
+
+class DirtyRectPresenter:
+    """Uploads only the screen regions that changed while the view stands still.
+
+    Draw code reports the rects it touched through ``mark``; each present
+    pushes this frame's rects plus the previous frame's (to erase what
+    moved away) via ``display.update``. The view is held until the camera
+    drifts more than ``scroll_threshold`` pixels, at which point the whole
+    frame is flipped. ``invalidate`` forces the next present to be full.
+    """
+
+    def __init__(self, scroll_threshold: int = DIRTY_SCROLL_THRESHOLD) -> None:
+        self.scroll_threshold = scroll_threshold
+        self.view_x: int | None = None
+        self.previous: list[pygame.Rect] = []
+        self.current: list[pygame.Rect] = []
+        self.full = True
+
+    def invalidate(self) -> None:
+        self.full = True
+
+    def view(self, camera_x: float) -> int:
+        target = int(camera_x)
+        if self.view_x is None or abs(target - self.view_x) > self.scroll_threshold:
+            self.view_x = target
+            self.full = True
+        return self.view_x
+
+    def mark(self, rect: pygame.Rect) -> None:
+        self.current.append(rect)
+
+    def present(self) -> None:
+        if self.full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.previous + self.current)
+        self.previous = self.current
+        self.current = []
+        self.full = False
+
+
+class ResolutionGovernor:
+    """Steps the internal render scale to keep frame times inside the budget.
+
+    Frame times are collected over a window; at the end of each window the
+    scale drops one step when the 90th percentile is close to the budget and
+    rises one step when it is so far below that the larger canvas (roughly
+    1.8x the pixels per step) would still fit.
+    """
+
+    def __init__(self, scales: tuple[float, ...] = RENDER_SCALES, budget_ms: float = FRAME_BUDGET_MS, window: int = GOVERNOR_WINDOW) -> None:
+        self.scales = scales
+        self.budget_ms = budget_ms
+        self.window = window
+        self.step = 0
+        self.samples: list[float] = []
+
+    @property
+    def scale(self) -> float:
+        return self.scales[self.step]
+
+    def observe(self, frame_ms: float) -> bool:
+        """Record one frame; return True when the scale changed."""
+        self.samples.append(frame_ms)
+        if len(self.samples) < self.window:
+            return False
+        p90 = percentile(sorted(self.samples), 0.90)
+        self.samples.clear()
+        if p90 > self.budget_ms * GOVERNOR_STEP_DOWN and self.step < len(self.scales) - 1:
+            self.step += 1
+            return True
+        if p90 < self.budget_ms * GOVERNOR_STEP_UP and self.step > 0:
+            self.step -= 1
+            return True
+        return False
+
+
+class InputState:
+    """Controls as of the latest input event, read once per tick as a ``TickInput``.
+
+    Key and button presses update the held direction keys and latch jump/throw until
+    the next ``snapshot``, so nothing is polled during a tick. Each press is
+    stamped when it comes off the event queue; ``snapshot`` moves the stamps
+    of presses it consumed to ``applied``, to be timed against the next
+    present. pygame does not expose SDL's event timestamps, so time an event
+    spent queued while the frame limiter slept is not counted.
+    """
+
+    def __init__(self) -> None:
+        # Held keys per direction, so letting go of one of two bound keys
+        # keeps moving while the other is down.
+        self.left_keys: set[int] = set()
+        self.right_keys: set[int] = set()
+        self.axis = 0.0
+        self.jump = False
+        self.throw = False
+        self.pending: list[float] = []
+        self.applied: list[float] = []
+
+    @property
+    def queued(self) -> bool:
+        return self.jump or self.throw
+
+    def release_keys(self) -> None:
+        self.left_keys.clear()
+        self.right_keys.clear()
+
+    def clear(self) -> None:
+        self.release_keys()
+        self.jump = self.throw = False
+        self.axis = 0.0
+        self.pending.clear()
+        self.applied.clear()
+
+    def key_down(self, key: int, stamp: float) -> None:
+        if key in LEFT_KEYS:
+            self.left_keys.add(key)
+        elif key in RIGHT_KEYS:
+            self.right_keys.add(key)
+        elif key in JUMP_KEYS:
+            self.jump = True
+        elif key in THROW_KEYS:
+            self.throw = True
+        else:
+            return
+        self.pending.append(stamp)
+
+    def key_up(self, key: int) -> None:
+        self.left_keys.discard(key)
+        self.right_keys.discard(key)
+
+    def button_down(self, button: int, throw_allowed: bool, stamp: float) -> None:
+        if button in JUMP_BUTTONS:
+            self.jump = True
+        elif button in THROW_BUTTONS and throw_allowed:
+            self.throw = True
+        else:
+            return
+        self.pending.append(stamp)
+
+    def axis_motion(self, value: float, stamp: float) -> None:
+        if abs(self.axis) <= AXIS_DEAD_ZONE < abs(value):
+            self.pending.append(stamp)
+        self.axis = value
+
+    def snapshot(self) -> TickInput:
+        if abs(self.axis) > AXIS_DEAD_ZONE:
+            move_x = clamp(self.axis, -1.0, 1.0)
+        else:
+            move_x = float(bool(self.right_keys)) - float(bool(self.left_keys))
+        controls = TickInput(move_x, self.jump, self.throw)
+        self.jump = self.throw = False
+        if self.pending:
+            self.applied.extend(self.pending)
+            self.pending.clear()
+        return controls
+
+
+class BavarianRunGame(World):
+    def __init__(
+        self,
+        fullscreen: bool = False,
+        dirty_rects: bool = False,
+        level: Level | None = None,
+        profile_csv: Path | None = None,
+        seed: int | None = None,
+        startup_report: bool = False,
+        render_scale: float | None = 1.0,
+        latency_report: bool = False,
+    ) -> None:
+        """``render_scale`` is the internal resolution for the world layers, or None to let a governor pick it."""
+        # Only the display is initialised up front; fonts open on first use
+        # and the joystick is picked up after the first frame is on screen.
+        self.startup = StartupTimer()
+        self.startup_report = startup_report
+        pygame.display.init()
+        pygame.display.set_caption("Bavarian Mug Run")
+        flags = pygame.FULLSCREEN if fullscreen else 0
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT), flags)
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(INPUT_EVENTS)
+        self.clock = pygame.time.Clock()
+        self.fonts = FontBook(FONT_FAMILY, FONT_STYLES)
+        self.governor = ResolutionGovernor() if render_scale is None else None
+        self.render_scale = 1.0
+        self.canvas = self.screen
+        self.gate_labels: dict[float, pygame.Surface] = {}
+        self.startup.lap("display")
+
+        self.sprites = SpriteCache()
+        for name, image in load_atlas().items():
+            self.sprites.add(name, image)
+        self.startup.lap("sprite atlas")
+        self.background = ParallaxBackground()
+        self.text = TextCache()
+        self.hud_key: tuple[int, int, int, int] | None = None
+        self.hud_lines: tuple[pygame.Surface, pygame.Surface] | None = None
+        self.message_key: str | None = None
+        self.message_box: pygame.Surface | None = None
+        self.dirty = DirtyRectPresenter() if dirty_rects else None
+        self.set_render_scale(self.governor.scale if self.governor else render_scale)
+        self.view_x = 0
+        self.alpha = 1.0
+        self.dropped_ticks = 0
+        self.drawn_state: str | None = None
+        self.show_profile = False
+        self.profile_panel: pygame.Surface | None = None
+        self.state_overlay: pygame.Surface | None = None
+        self.idle_key: tuple | None = None
+        self.idle_frame: pygame.Surface | None = None
+        self.idle_stale = False
+
+        self.joystick: pygame.joystick.JoystickType | None = None
+        self.running = True
+        self.fullscreen = fullscreen
+        self.input = InputState()
+        self.latency = LatencyMeter()
+        self.latency_report = latency_report
+        super().__init__(level, seed)
+        self.profiler = FrameProfiler(csv_path=profile_csv)
+        self.startup.lap("world")
+
+    def _init_joystick(self) -> pygame.joystick.JoystickType | None:
+        pygame.joystick.init()
+        if pygame.joystick.get_count() > 0:
+            js = pygame.joystick.Joystick(0)
+            js.init()
+            # Axis motion arrives as events from here on.
+            self.input.axis = js.get_axis(0) if js.get_numaxes() else 0.0
+            return js
+        self.input.axis = 0.0
+        return None
+
+    def idle_timeout_ms(self) -> int:
+        """How long an idle screen may sleep before its next timed change."""
+        if self.message_timer > 0:
+            return max(1, min(IDLE_WAIT_MS, math.ceil(self.message_timer * 1000)))
+        return IDLE_WAIT_MS
+
+    def finish_startup(self) -> None:
+        """Run after the first frame is presented: do the deferred setup and report timings."""
+        self.startup.lap("first frame")
+        self.startup.add("  of which fonts", self.fonts.load_ms)
+        self.joystick = self._init_joystick()
+        self.startup.lap("joystick (after first frame)")
+        if self.startup_report:
+            print(self.startup.report())
+
+    def set_render_scale(self, scale: float) -> None:
+        """Draw the world layers into a canvas at ``scale`` of the screen, upscaled before the HUD."""
+        self.render_scale = scale
+        self.idle_key = None
+        if scale == 1.0:
+            self.canvas = self.screen
+        else:
+            self.canvas = pygame.Surface((round(WIDTH * scale), round(HEIGHT * scale))).convert()
+        if self.dirty:
+            self.dirty.invalidate()
+
+    def toggle_fullscreen(self) -> None:
+        self.fullscreen = not self.fullscreen
+        flags = pygame.FULLSCREEN if self.fullscreen else 0
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT), flags)
+        self.set_render_scale(self.render_scale)
+        self.background.invalidate()
+        if self.dirty:
+            self.dirty.invalidate()
+
+    def handle_event(self, event: pygame.event.Event) -> None:
+        if event.type == pygame.QUIT:
+            self.running = False
+            return
+
+        if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+            self.idle_stale = True
+        elif event.type == pygame.WINDOWFOCUSLOST:
+            # Key releases made while unfocused never arrive.
+            self.input.release_keys()
+
+        if event.type == pygame.KEYUP:
+            self.input.key_up(event.key)
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                self.running = False
+            elif event.key == pygame.K_F11:
+                self.toggle_fullscreen()
+            elif event.key == pygame.K_F3:
+                self.show_profile = not self.show_profile
+                self.profile_panel = None
+                if self.dirty:
+                    self.dirty.invalidate()
+            else:
+                self.input.key_down(event.key, time.perf_counter())
+
+        if event.type == pygame.JOYDEVICEADDED and self.joystick is None:
+            self.joystick = self._init_joystick()
+        elif event.type == pygame.JOYDEVICEREMOVED and self.joystick and event.instance_id == self.joystick.get_instance_id():
+            self.joystick = self._init_joystick()
+
+        if event.type == pygame.JOYBUTTONDOWN:
+            self.input.button_down(event.button, self.state == "running", time.perf_counter())
+        elif event.type == pygame.JOYAXISMOTION and event.axis == 0 and self.joystick and event.instance_id == self.joystick.get_instance_id():
+            self.input.axis_motion(event.value, time.perf_counter())
+
+    def presented(self) -> None:
+        """Charge every input consumed by a tick since the last present to this one."""
+        now = time.perf_counter()
+        for stamp in self.input.applied:
+            self.latency.record((now - stamp) * 1000.0)
+        self.input.applied.clear()
+
     def draw_background(self) -> None:
-        self.screen.fill((125, 198, 245))
-        pygame.draw.rect(self.screen, (94, 178, 233), (0, 0, WIDTH, 160))
-
-        mountain_offset = int(self.camera_x * 0.18)
-        for i in range(-1, 8):
-            x = i * 220 - (mountain_offset % 220)
-            pygame.draw.polygon(self.screen, (100, 129, 152), [(x, 290), (x + 100, 180), (x + 200, 290)])
-            pygame.draw.polygon(self.screen, (131, 164, 188), [(x + 20, 290), (x + 105, 200), (x + 190, 290)])
-
-        tent_offset = int(self.camera_x * 0.42)
-        for i in range(-1, 11):
-            x = i * 150 - (tent_offset % 150)
-            pygame.draw.polygon(self.screen, (248, 237, 214), [(x + 10, GROUND_Y), (x + 70, 338), (x + 130, GROUND_Y)])
-            pygame.draw.rect(self.screen, (220, 71, 54), (x + 14, 395, 112, 12))
-            pygame.draw.rect(self.screen, (241, 230, 205), (x + 34, 410, 72, 50))
+        self.background.draw(self.canvas, self.view_x)
 
     def draw_solids(self) -> None:
-        ground_y = int(GROUND_Y)
-        pygame.draw.rect(self.screen, (58, 149, 89), (0, ground_y, WIDTH, HEIGHT - ground_y))
-        pygame.draw.rect(self.screen, (46, 112, 67), (0, ground_y, WIDTH, 12))
-
-        for solid in self.solids[1:]:
-            x = solid.x - int(self.camera_x)
-            rect = pygame.Rect(x, solid.y, solid.w, solid.h)
-            if rect.right < -20 or rect.left > WIDTH + 20:
+        canvas = self.canvas
+        scale = self.render_scale
+        ground_y = int(GROUND_Y * scale)
+        pygame.draw.rect(canvas, (58, 149, 89), (0, ground_y, canvas.get_width(), canvas.get_height() - ground_y))
+        pygame.draw.rect(canvas, (46, 112, 67), (0, ground_y, canvas.get_width(), int(12 * scale)))
+
+        for solid in self.solids:
+            x = solid.x - self.view_x
+            if x + solid.w < -20 or x > WIDTH + 20:
                 continue
-            pygame.draw.rect(self.screen, (157, 113, 74), rect, border_radius=5)
-            pygame.draw.rect(self.screen, (128, 90, 58), (rect.x, rect.y + rect.h - 6, rect.w, 6), border_radius=3)
+            rect = pygame.Rect(int(x * scale), int(solid.y * scale), int(solid.w * scale), int(solid.h * scale))
+            lip = int(6 * scale)
+            pygame.draw.rect(canvas, (157, 113, 74), rect, border_radius=int(5 * scale))
+            pygame.draw.rect(canvas, (128, 90, 58), (rect.x, rect.y + rect.h - lip, rect.w, lip), border_radius=int(3 * scale))
 
     def draw_entities(self) -> None:
-        for item in self.collectibles:
-            if item.taken:
-                continue
-            bob = int(4 * math.sin(self.time_s * 3.6 + item.bob_seed))
-            img = self.assets["beer"] if item.kind == "beer" else self.assets["pretzel"]
-            x = item.rect.x - int(self.camera_x)
-            y = item.rect.y + bob
-            self.screen.blit(img, (x, y))
-
-        for enemy in self.enemies:
-            sprite = self.assets["waiter"] if enemy.kind == "waiter" else self.assets["police"]
-            if enemy.direction < 0:
-                sprite = pygame.transform.flip(sprite, True, False)
-            self.screen.blit(sprite, (enemy.rect.x - int(self.camera_x), enemy.rect.y))
-
-        for shot in self.projectiles:
-            img = self.assets["mug"]
-            if shot.velocity.x < 0:
-                img = pygame.transform.flip(img, True, False)
-            self.screen.blit(img, (shot.rect.x - int(self.camera_x), shot.rect.y))
-
-        for shot in self.enemy_projectiles:
-            x = shot.rect.x - int(self.camera_x)
-            pygame.draw.circle(self.screen, (49, 104, 198), (x + 7, shot.rect.y + 7), 7)
-            pygame.draw.circle(self.screen, (219, 231, 255), (x + 5, shot.rect.y + 5), 2)
+        """Queue every sprite inside the view and submit them in one ``blits`` call.
+
+        Moving entities are drawn ``alpha`` of the way from their previous
+        tick's position to the current one.
+        """
+        view_x = self.view_x
+        alpha = self.alpha
+        scale = self.render_scale
+        sprites = self.sprites
+        sprite = sprites.get if scale == 1.0 else lambda name, facing=1: sprites.scaled(name, facing, scale)
+        batch: list[tuple[pygame.Surface, tuple[int, int]]] = []
+
+        first = bisect.bisect_left(self.collectible_xs, view_x - COLLECTIBLE_MAX_WIDTH)
+        last = bisect.bisect_right(self.collectible_xs, view_x + WIDTH)
+        visible = self.collectibles[first:last]
+        phase = self.time_s * 3.6
+        bobs = [int(4 * math.sin(phase + item.bob_seed)) for item in visible]
+        batch.extend((sprite(item.kind), (item.rect.x - view_x, item.rect.y + bob)) for item, bob in zip(visible, bobs))
+
+        view = pygame.Rect(view_x, 0, WIDTH, HEIGHT)
+        for enemy in self.enemy_grid.query(view):
+            if enemy.rect.colliderect(view):
+                x = int(lerp(enemy.prev_x, enemy.x, alpha))
+                batch.append((sprite(enemy.kind, -1 if enemy.direction < 0 else 1), (x - view_x, enemy.rect.y)))
+
+        mugs = self.projectiles
+        for slot in mugs.live_slots():
+            x = int(lerp(mugs.px[slot], mugs.x[slot], alpha)) - view_x
+            if -mugs.width < x < WIDTH:
+                y = int(lerp(mugs.py[slot], mugs.y[slot], alpha))
+                batch.append((sprite("mug", -1 if mugs.vx[slot] < 0 else 1), (x, y)))
+
+        bottles = self.enemy_projectiles
+        bottle = sprite("bottle")
+        for slot in bottles.live_slots():
+            x = int(lerp(bottles.px[slot], bottles.x[slot], alpha)) - view_x
+            if -bottles.width < x < WIDTH:
+                batch.append((bottle, (x, int(lerp(bottles.py[slot], bottles.y[slot], alpha)))))
 
         blink = self.player.invuln_timer > 0 and int(self.time_s * 14) % 2 == 0
         if not blink:
-            player_img = self.assets["player"]
-            if self.player.facing < 0:
-                player_img = pygame.transform.flip(player_img, True, False)
-            self.screen.blit(player_img, (self.player.rect.x - int(self.camera_x), self.player.rect.y))
+            player = self.player
+            x = int(lerp(player.prev[0], player.rect.x, alpha))
+            y = int(lerp(player.prev[1], player.rect.y, alpha))
+            batch.append((sprite("player", player.facing), (x - view_x, y)))
+
+        if scale != 1.0:
+            self.canvas.blits([(image, (int(x * scale), int(y * scale))) for image, (x, y) in batch], doreturn=False)
+        elif self.dirty:
+            for rect in self.screen.blits(batch):
+                self.dirty.mark(rect)
+        else:
+            self.screen.blits(batch, doreturn=False)
 
     def draw_goal_gate(self) -> None:
-        gate_x_world = WORLD_WIDTH - 62
-        gate_x = gate_x_world - int(self.camera_x)
+        gate_x_world = self.world_width - 62
+        gate_x = gate_x_world - self.view_x
         if gate_x < WIDTH:
-            pygame.draw.rect(self.screen, (182, 139, 82), (gate_x, GROUND_Y - 130, 56, 130))
-            pygame.draw.rect(self.screen, (104, 62, 39), (gate_x + 6, GROUND_Y - 126, 44, 118))
-            text = self.small_font.render("Fest", True, (255, 244, 222))
-            self.screen.blit(text, (gate_x + 8, GROUND_Y - 86))
+            scale = self.render_scale
+            label = self.gate_labels.get(scale)
+            if label is None:
+                label = self.text.render(self.fonts.get("small"), "Fest", (255, 244, 222))
+                if scale != 1.0:
+                    label = scale_surface(label, scale)
+                self.gate_labels[scale] = label
+            pygame.draw.rect(self.canvas, (182, 139, 82), [int(v * scale) for v in (gate_x, GROUND_Y - 130, 56, 130)])
+            pygame.draw.rect(self.canvas, (104, 62, 39), [int(v * scale) for v in (gate_x + 6, GROUND_Y - 126, 44, 118)])
+            self.canvas.blit(label, (int((gate_x + 8) * scale), int((GROUND_Y - 86) * scale)))
 
     def draw_hud(self) -> None:
-        score_text = self.font.render(f"Score {self.score}", True, (255, 255, 255))
-        stats_text = self.small_font.render(
-            f"Beer {self.beers}/{GOAL_BEERS}  Pretzels {self.pretzels}  Lives {self.player.lives}",
-            True,
-            (255, 255, 255),
-        )
-        self.screen.blit(score_text, (20, 14))
-        self.screen.blit(stats_text, (20, 52))
+        hud_key = (self.score, self.beers, self.pretzels, self.player.lives)
+        if hud_key != self.hud_key:
+            self.hud_key = hud_key
+            self.hud_lines = (
+                self.fonts.get("hud").render(f"Score {self.score}", True, (255, 255, 255)),
+                self.fonts.get("small").render(
+                    f"Beer {self.beers}/{GOAL_BEERS}  Pretzels {self.pretzels}  Lives {self.player.lives}",
+                    True,
+                    (255, 255, 255),
+                ),
+            )
+        score_text, stats_text = self.hud_lines
+        self.blit(score_text, (20, 14))
+        self.blit(stats_text, (20, 52))
 
         if self.message_timer > 0:
-            msg = self.small_font.render(self.message, True, (22, 22, 22))
-            box = pygame.Rect((WIDTH - msg.get_width()) // 2 - 14, 82, msg.get_width() + 28, 36)
-            pygame.draw.rect(self.screen, (249, 225, 168), box, border_radius=8)
-            pygame.draw.rect(self.screen, (184, 147, 83), box, width=2, border_radius=8)
-            self.screen.blit(msg, (box.x + 14, box.y + 8))
+            if self.message != self.message_key:
+                self.message_key = self.message
+                self.message_box = self.render_message_box(self.message)
+            self.blit(self.message_box, ((WIDTH - self.message_box.get_width()) // 2, 82))
+
+    def render_message_box(self, message: str) -> pygame.Surface:
+        msg = self.fonts.get("small").render(message, True, (22, 22, 22))
+        box = pygame.Rect(0, 0, msg.get_width() + 28, 36)
+        surface = pygame.Surface(box.size, pygame.SRCALPHA)
+        pygame.draw.rect(surface, (249, 225, 168), box, border_radius=8)
+        pygame.draw.rect(surface, (184, 147, 83), box, width=2, border_radius=8)
+        surface.blit(msg, (14, 8))
+        return surface.convert_alpha()
 
     def draw_state_overlay(self) -> None:
         if self.state == "running":
             return
 
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((10, 10, 10, 130))
-        self.screen.blit(overlay, (0, 0))
+        if self.state_overlay is None:
+            overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+            overlay.fill((10, 10, 10, 130))
+            self.state_overlay = overlay.convert_alpha()
+        self.screen.blit(self.state_overlay, (0, 0))
 
         if self.state == "menu":
             title = "Bavarian Mug Run"
@@ -591,45 +1494,291 @@ class BavarianRunGame:
             subtitle = f"Final score {self.score} with {self.beers} beers."
             prompt = "Press SPACE to play again"
 
-        title_s = self.large_font.render(title, True, (255, 246, 220))
-        subtitle_s = self.small_font.render(subtitle, True, (255, 255, 255))
-        prompt_s = self.small_font.render(prompt, True, (255, 255, 255))
+        title_s = self.text.render(self.fonts.get("large"), title, (255, 246, 220))
+        subtitle_s = self.text.render(self.fonts.get("small"), subtitle, (255, 255, 255))
+        prompt_s = self.text.render(self.fonts.get("small"), prompt, (255, 255, 255))
         self.screen.blit(title_s, ((WIDTH - title_s.get_width()) // 2, HEIGHT // 2 - 78))
         self.screen.blit(subtitle_s, ((WIDTH - subtitle_s.get_width()) // 2, HEIGHT // 2 - 18))
         self.screen.blit(prompt_s, ((WIDTH - prompt_s.get_width()) // 2, HEIGHT // 2 + 18))
 
     def draw_controls_hint(self) -> None:
-        hint = "Move A/D or Left/Right | Jump SPACE | Throw Mug J/LCTRL | F11 fullscreen | ESC quit"
-        rendered = self.small_font.render(hint, True, (243, 243, 243))
+        hint = "Move A/D or Left/Right | Jump SPACE | Throw Mug J/LCTRL | F11 fullscreen | F3 profiler | ESC quit"
+        rendered = self.text.render(self.fonts.get("small"), hint, (243, 243, 243))
         self.screen.blit(rendered, (12, HEIGHT - 30))
 
+    def blit(self, surface: pygame.Surface, pos: tuple[int, int]) -> None:
+        rect = self.screen.blit(surface, pos)
+        if self.dirty:
+            self.dirty.mark(rect)
+
     def draw(self) -> None:
+        """Compose and present a frame.
+
+        Menu, game-over and win screens are composed once and frozen: until
+        something on them changes, later calls present nothing, or re-present
+        the frozen copy after the window was exposed.
+        """
+        if self.state != "running":
+            idle_key = (self.state, self.score, self.beers, self.message, self.message_timer > 0, self.show_profile, self.render_scale)
+            if idle_key == self.idle_key:
+                if self.idle_stale:
+                    self.screen.blit(self.idle_frame, (0, 0))
+                    pygame.display.flip()
+                    self.idle_stale = False
+                # Input that left a frozen screen unchanged has nothing to time.
+                self.input.applied.clear()
+                return
+        else:
+            idle_key = None
+        self.idle_key = None
+        if self.dirty:
+            if self.state != self.drawn_state:
+                self.drawn_state = self.state
+                self.dirty.invalidate()
+            self.view_x = self.dirty.view(lerp(self.prev_camera_x, self.camera_x, self.alpha))
+        else:
+            self.view_x = int(lerp(self.prev_camera_x, self.camera_x, self.alpha))
+        prof = self.profiler
+        prof.begin()
         self.draw_background()
+        prof.lap("draw_background")
         self.draw_solids()
+        prof.lap("draw_solids")
         self.draw_goal_gate()
+        prof.lap("draw_goal_gate")
         self.draw_entities()
+        prof.lap("draw_entities")
+        if self.canvas is not self.screen:
+            pygame.transform.scale(self.canvas, (WIDTH, HEIGHT), self.screen)
+            if self.dirty:
+                self.dirty.invalidate()
+        prof.lap("upscale")
         self.draw_hud()
+        prof.lap("draw_hud")
         self.draw_controls_hint()
+        prof.lap("draw_controls_hint")
         self.draw_state_overlay()
-        pygame.display.flip()
-
-    def run(self) -> None:
-        self.jump_queued = False
+        prof.lap("draw_state_overlay")
+        if self.show_profile:
+            self.draw_profile_overlay()
+        prof.begin()
+        if self.dirty:
+            self.dirty.present()
+        else:
+            pygame.display.flip()
+        prof.lap("display.flip")
+        if self.input.applied:
+            self.presented()
+        if idle_key is not None:
+            self.idle_key = idle_key
+            self.idle_frame = self.screen.copy()
+            self.idle_stale = False
+        frame_ms = prof.end_frame()
+        if self.governor and self.governor.observe(frame_ms):
+            self.set_render_scale(self.governor.scale)
+
+    def draw_profile_overlay(self) -> None:
+        if self.profile_panel is None or self.profiler.frames % PROFILE_OVERLAY_REFRESH == 0:
+            rows = [("phase (ms)", "p50", "p95", "p99")]
+            rows += [(name, f"{p50:.2f}", f"{p95:.2f}", f"{p99:.2f}") for name, p50, p95, p99 in self.profiler.summary()]
+            if self.latency.count:
+                p50, p95, p99, _worst = self.latency.summary()
+                rows.append(("input to present", f"{p50:.2f}", f"{p95:.2f}", f"{p99:.2f}"))
+            rows.append(("dropped ticks", "", "", str(self.dropped_ticks)))
+            tiny_font = self.fonts.get("tiny")
+            line_h = tiny_font.get_linesize()
+            panel = pygame.Surface((340, line_h * len(rows) + 12), pygame.SRCALPHA)
+            panel.fill((10, 10, 10, 190))
+            for i, row in enumerate(rows):
+                y = 6 + i * line_h
+                panel.blit(tiny_font.render(row[0], True, (235, 235, 235)), (8, y))
+                for column, value in zip((210, 270, 330), row[1:]):
+                    cell = tiny_font.render(value, True, (235, 235, 235))
+                    panel.blit(cell, (column - cell.get_width(), y))
+            self.profile_panel = panel.convert_alpha()
+        self.blit(self.profile_panel, (WIDTH - self.profile_panel.get_width() - 8, 8))
+
+    def run(self, tick_rate: int = 60, recorder: InputRecorder | None = None, replay: InputReplay | None = None) -> None:
+        """Simulate on a fixed timestep and render once per frame, interpolating between ticks.
+
+        Frame time is banked in an accumulator and spent in ticks of exactly
+        ``1 / tick_rate``, so the simulation is the same on every device and
+        a recording or replay is just that tick stream. A slow frame runs at
+        most MAX_TICKS_PER_FRAME catch-up ticks; any backlog beyond that is
+        dropped, slowing the game down rather than stalling it.
+
+        In live play the menu, game-over and win screens sleep in
+        ``event.wait`` until input arrives or the next timed change is due,
+        instead of spinning at the frame rate.
+
+        Controls are read once per tick from ``self.input``; in live play the
+        delay from each press to the present that first reflects it is kept
+        in ``self.latency``.
+        """
+        self.input.clear()
+        if replay:
+            tick_rate = replay.tick_rate
+        elif recorder:
+            tick_rate = recorder.tick_rate
+        dt = 1.0 / tick_rate
+        replay_ticks = iter(replay) if replay else None
+        low_power = recorder is None and replay is None
+        accumulator = 0.0
+        first_frame = True
         while self.running:
-            dt = self.clock.tick(60) / 1000.0
+            idle = low_power and self.state != "running" and not first_frame and not self.input.queued
+            if idle:
+                self.handle_event(pygame.event.wait(self.idle_timeout_ms()))
+                # Idle ticks only count down timers, so the whole wait is
+                # simulated, however long it was.
+                accumulator += self.clock.tick() / 1000.0
+            else:
+                accumulator += min(self.clock.tick(TARGET_FPS) / 1000.0, MAX_FRAME_S)
             for event in pygame.event.get():
                 self.handle_event(event)
-            self.update(dt)
+            ticks = 0
+            while accumulator >= dt and (idle or ticks < MAX_TICKS_PER_FRAME):
+                controls = self.input.snapshot()
+                if replay_ticks is not None:
+                    self.input.applied.clear()
+                    tick = next(replay_ticks, None)
+                    if tick is None:
+                        self.running = False
+                        break
+                    controls = TickInput(*tick)
+                elif recorder is not None:
+                    controls = TickInput(*recorder.record(controls.move_x, controls.jump, controls.throw))
+                self.update(dt, controls)
+                accumulator -= dt
+                ticks += 1
+                if idle and self.state == "running":
+                    # A new round starts from this tick, not from the wait.
+                    accumulator = 0.0
+                    break
+            if accumulator >= dt:
+                skipped = int(accumulator / dt)
+                self.dropped_ticks += skipped
+                accumulator -= skipped * dt
+            self.alpha = accumulator / dt
             self.draw()
+            if first_frame:
+                self.finish_startup()
+                first_frame = False
+        if recorder is not None or replay is not None:
+            print(self.summary())
+        if self.latency_report:
+            print(self.latency.report())
+            print(f"Dropped ticks (frame-skip past {MAX_TICKS_PER_FRAME} catch-up ticks): {self.dropped_ticks}")
+        self.profiler.close()
         pygame.quit()
 
 
+def autopilot(world: World) -> TickInput:
+    """Scripted controls for unattended runs: walk right, hop over trouble, throw at enemies ahead."""
+    player = world.player
+    gaps = [enemy.rect.centerx - player.rect.centerx for enemy in world.enemies]
+    ahead = [gap for gap in gaps if 0 < gap < 420]
+    jump = player.on_ground and (any(gap < 150 for gap in ahead) or int(world.time_s * 10) % 17 == 0)
+    return TickInput(1.0, jump, bool(ahead))
+
+
+def run_replay_headless(replay: InputReplay, level: Level) -> None:
+    """Replay a recording on its fixed timestep as fast as the CPU allows."""
+    world = World(level, replay.seed)
+    dt = 1.0 / replay.tick_rate
+    started = time.perf_counter()
+    for tick in replay:
+        world.update(dt, TickInput(*tick))
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    print(f"Replayed {len(replay)} ticks in {elapsed:.2f}s: {len(replay) / elapsed:.0f} ticks/s")
+    print(world.summary())
+
+
+def print_memory_report(world: World) -> None:
+    for name, entry in world.memory_report().items():
+        print(f"{name:<20} {entry['count']:8d}  {entry['bytes'] / 1024:9.1f} KiB")
+
+
+def run_headless(minutes: float, tick_rate: int, level: Level, seed: int | None = None, memory_report: bool = False) -> None:
+    """Step the simulation on a fixed timestep as fast as the CPU allows."""
+    world = World(level, seed)
+    dt = 1.0 / tick_rate
+    ticks = int(minutes * 60 * tick_rate)
+    rounds = 0
+    round_started = 0.0
+    started = time.perf_counter()
+    for _ in range(ticks):
+        if world.state != "running" or world.time_s - round_started > HEADLESS_ROUND_LIMIT_S:
+            world.start()
+            rounds += 1
+            round_started = world.time_s
+        world.update(dt, autopilot(world))
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    print(
+        f"Simulated {minutes:g} min ({ticks} ticks, {rounds} rounds) in {elapsed:.2f}s: "
+        f"{ticks / elapsed:.0f} ticks/s, {minutes * 60 / elapsed:.0f}x real time (seed {world.seed})"
+    )
+    if memory_report:
+        print_memory_report(world)
+
+
+def seed_arg(text: str) -> int:
+    """A seed that World and the replay header both hold as-is."""
+    seed = int(text)
+    if not 0 <= seed < SEED_LIMIT:
+        raise argparse.ArgumentTypeError(f"seed must be in 0..{SEED_LIMIT - 1}")
+    return seed
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Bavarian-themed Raspberry Pi platformer")
     parser.add_argument("--fullscreen", action="store_true", help="Start in fullscreen mode")
+    parser.add_argument(
+        "--level",
+        default="default",
+        help="Level name in levels/, path to a level .json, or gen:SEED:LENGTH for a procedural level",
+    )
+    parser.add_argument("--dirty-rects", action="store_true", help="Upload only changed screen regions")
+    parser.add_argument("--profile-csv", type=Path, help="Write per-frame phase timings to this CSV on exit")
+    parser.add_argument("--seed", type=seed_arg, help="Seed for level randomness, 0..2**32-1 (default: random)")
+    parser.add_argument("--record", type=Path, metavar="FILE", help="Record the seed and per-tick inputs to FILE")
+    parser.add_argument("--replay", type=Path, metavar="FILE", help="Replay a recording; combine with --headless for max speed")
+    parser.add_argument(
+        "--render-scale",
+        choices=("auto", "100", "75", "50"),
+        default="100",
+        help="Internal resolution of the world layers in percent, or auto to adapt to frame times",
+    )
+    parser.add_argument("--startup-report", action="store_true", help="Print a startup time breakdown after the first frame")
+    parser.add_argument("--latency-report", action="store_true", help="Print input-to-present latency percentiles on exit")
+    parser.add_argument("--headless", action="store_true", help="Run the simulation without a display")
+    parser.add_argument("--memory-report", action="store_true", help="Print entity counts and memory after --headless")
+    parser.add_argument("--sim-minutes", type=float, default=10.0, help="Simulated minutes for --headless")
+    parser.add_argument("--tick-rate", type=int, default=60, help="Fixed simulation ticks per second")
     return parser.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_args()
-    BavarianRunGame(fullscreen=args.fullscreen).run()
+    replay = InputReplay.load(args.replay) if args.replay else None
+    level_name = replay.level_name if replay else args.level
+    level = open_level(level_name)
+    if args.headless and replay:
+        run_replay_headless(replay, level)
+    elif args.headless:
+        run_headless(args.sim_minutes, args.tick_rate, level, args.seed, args.memory_report)
+    else:
+        app = BavarianRunGame(
+            fullscreen=args.fullscreen,
+            dirty_rects=args.dirty_rects,
+            level=level,
+            profile_csv=args.profile_csv,
+            seed=replay.seed if replay else args.seed,
+            startup_report=args.startup_report,
+            latency_report=args.latency_report,
+            render_scale=None if args.render_scale == "auto" else int(args.render_scale) / 100,
+        )
+        recorder = InputRecorder(app.seed, args.tick_rate, level_name) if args.record else None
+        app.run(args.tick_rate, recorder, replay)
+        if recorder:
+            recorder.save(args.record)
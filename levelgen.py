@@ -0,0 +1,191 @@
+"""Seeded procedural levels of any length.
+
+``generate_level`` walks the strip left to right with a seeded RNG and fills
+the same flat arrays a compiled ``.lvl`` holds: platforms, ground and
+platform collectible spawns, and enemy patrols. Platform heights and gaps
+come from ``JumpReach``, so every platform can be reached either from the
+ground or by a jump from the previous one. At least ``goal_beers`` spawns
+along the ground lane are sure beers, so a level of any length can be won.
+``load_generated`` keeps the
+result in ``levels/generated/`` keyed by seed, length and generator version,
+so a level is only built once.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import zlib
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+
+from levels import LEVEL_DIR, COMPILED_SUFFIX, Level, empty_level, read_compiled, write_compiled
+
+
+GENERATED_DIR = LEVEL_DIR / "generated"
+GENERATED_PREFIX = "gen:"
+# Bump whenever the output for a given seed and length changes.
+GENERATOR_VERSION = 2
+
+# Fraction of the ideal jump used for placement, leaving room for late jumps.
+REACH_MARGIN = 0.8
+START_CLEAR = 300
+END_CLEAR = 400
+PLATFORM_HEIGHT = 22
+PLATFORM_WIDTH = (150, 230)
+PLATFORM_GAP = (120, 380)
+MIN_RISE = 58
+MAX_TOP_RISE = 300
+STAIR_CHANCE = 0.35
+GROUND_STEP = (180, 260)
+GROUND_LANE = (240, 200)
+# Closest spacing of ground spawns when a short lane must fit every sure beer.
+MIN_GROUND_STEP = 32
+GROUND_LIFT = (44, 40)
+PLATFORM_LIFT = (40, 34)
+ENEMY_SPACING = (650, 1050)
+ENEMY_PATROL = (60, 120, 260, 420)
+ENEMY_SPEED = (85.0, 105.0)
+# Enemies get this much denser and faster by the end of the strip.
+ENEMY_RAMP = 0.35
+ENEMY_SPEED_RAMP = 25.0
+PLAYER_HEIGHT = 62
+
+
+@dataclass(frozen=True)
+class JumpReach:
+    """What one jump covers, from the player's jump speed, gravity and run speed."""
+
+    jump_speed: float
+    gravity: float
+    run_speed: float
+
+    @property
+    def max_rise(self) -> float:
+        return self.jump_speed ** 2 / (2 * self.gravity)
+
+    def distance(self, rise: float) -> float:
+        """Horizontal distance covered by a jump that lands ``rise`` px higher than it started."""
+        v = abs(self.jump_speed)
+        airtime = (v + math.sqrt(max(0.0, v * v - 2 * self.gravity * rise))) / self.gravity
+        return self.run_speed * airtime
+
+
+def generate_level(seed: int, width: int, ground_y: int, reach: JumpReach, goal_beers: int) -> Level:
+    lane = width - GROUND_LANE[0] - GROUND_LANE[1]
+    if lane < goal_beers * MIN_GROUND_STEP:
+        raise ValueError(f"a {width} px level is too short for {goal_beers} beers")
+    rng = random.Random(seed)
+    randint = rng.randint
+    level = empty_level(f"Generated {seed}", width)
+    platforms = level.platforms
+    spawns = level.spawns
+    odds = level.spawn_odds
+
+    safe_rise = int(reach.max_rise * REACH_MARGIN)
+    ground_rise = min(safe_rise, MAX_TOP_RISE)
+    top_limit = ground_y - MAX_TOP_RISE
+    # Platforms whose underside is below head height block the ground lane.
+    blocking = ground_y - PLATFORM_HEIGHT - PLAYER_HEIGHT
+    blockers: list[tuple[int, int, int]] = []
+
+    x = START_CLEAR
+    prev_y = ground_y
+    stop = width - END_CLEAR
+    while True:
+        gap = randint(*PLATFORM_GAP)
+        w = randint(*PLATFORM_WIDTH)
+        x += gap
+        if x + w > stop:
+            break
+        y = ground_y - randint(MIN_RISE, ground_rise)
+        if prev_y < ground_y and rng.random() < STAIR_CHANCE:
+            # Step up from the previous platform instead, if the gap allows it.
+            rise = randint(MIN_RISE // 2, safe_rise)
+            if prev_y - rise >= top_limit and gap <= reach.distance(rise) * REACH_MARGIN:
+                y = prev_y - rise
+        platforms.extend((x, y, w, PLATFORM_HEIGHT))
+        spawns.extend((x + w // 2 - 12, y, PLATFORM_LIFT[0], PLATFORM_LIFT[1]))
+        odds.extend((0.75, 0.65))
+        if y > blocking:
+            blockers.append((x - 30, x + w, y))
+        x += w
+        prev_y = y
+
+    # Ground spawns skip past low platforms, with the step tightened so the
+    # free stretches of a short lane still fit goal_beers of them. A lane
+    # mostly covered by low platforms puts spawns on their tops instead.
+    lane_start, lane_stop = GROUND_LANE[0], width - GROUND_LANE[1]
+    free = lane - sum(max(0, min(right, lane_stop) - max(left, lane_start)) for left, right, _top in blockers)
+    lift = free < goal_beers * MIN_GROUND_STEP
+    step_max = max(MIN_GROUND_STEP, min(GROUND_STEP[1], (lane if lift else free) // max(goal_beers, 1)))
+    step_min = min(GROUND_STEP[0], step_max)
+    ground_spawns: list[int] = []
+    blocker = 0
+    x = lane_start
+    while x < lane_stop:
+        while blocker < len(blockers) and blockers[blocker][1] <= x:
+            blocker += 1
+        if blocker < len(blockers) and x >= blockers[blocker][0]:
+            left, right, top = blockers[blocker]
+            if not lift:
+                x = right
+                continue
+            spawns.extend((min(max(x, left + 30), right - 28), top, PLATFORM_LIFT[0], PLATFORM_LIFT[1]))
+        else:
+            spawns.extend((x, ground_y, GROUND_LIFT[0], GROUND_LIFT[1]))
+        ground_spawns.append(len(odds) // 2)
+        odds.extend((1.0, 0.6))
+        x += randint(step_min, step_max)
+
+    # Spread the sure beers evenly over the lane.
+    for i in range(goal_beers):
+        spawn = ground_spawns[i * len(ground_spawns) // goal_beers]
+        odds[2 * spawn:2 * spawn + 2] = array("d", (1.0, 1.0))
+
+    x = 560
+    while x < stop:
+        progress = x / width
+        patrol_min = max(0, x - randint(ENEMY_PATROL[0], ENEMY_PATROL[1]))
+        patrol_max = min(width, x + randint(ENEMY_PATROL[2], ENEMY_PATROL[3]))
+        level.enemies.extend((randint(0, 1), x, patrol_min, patrol_max))
+        level.enemy_speeds.append(round(rng.uniform(*ENEMY_SPEED) + ENEMY_SPEED_RAMP * progress, 1))
+        x += int(randint(*ENEMY_SPACING) * (1.0 - ENEMY_RAMP * progress))
+    return level
+
+
+def cache_path(seed: int, width: int, ground_y: int, reach: JumpReach, goal_beers: int) -> Path:
+    # The physics and goal go into the name too, so tuning them never serves a stale layout.
+    physics = zlib.crc32(repr((ground_y, reach, goal_beers)).encode("ascii"))
+    return GENERATED_DIR / f"{seed}-{width}-v{GENERATOR_VERSION}-{physics:08x}{COMPILED_SUFFIX}"
+
+
+def load_generated(seed: int, width: int, ground_y: int, reach: JumpReach, goal_beers: int) -> Level:
+    """Return the generated level for (seed, width), building and caching it on a miss."""
+    path = cache_path(seed, width, ground_y, reach, goal_beers)
+    if path.exists():
+        try:
+            return read_compiled(path)
+        except ValueError:
+            pass
+    level = generate_level(seed, width, ground_y, reach, goal_beers)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_compiled(level, path)
+    except OSError:
+        pass
+    return level
+
+
+def parse_spec(name: str) -> tuple[int, int] | None:
+    """Split a ``gen:SEED:LENGTH`` level name into (seed, length); None for other names."""
+    if not name.startswith(GENERATED_PREFIX):
+        return None
+    try:
+        seed, width = (int(part) for part in name[len(GENERATED_PREFIX):].split(":"))
+    except ValueError:
+        raise ValueError(f"generated level names look like {GENERATED_PREFIX}SEED:LENGTH, not {name!r}") from None
+    if width < START_CLEAR + END_CLEAR:
+        raise ValueError(f"generated levels need at least {START_CLEAR + END_CLEAR} px, not {width}")
+    return seed, width
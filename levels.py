@@ -0,0 +1,198 @@
+"""Level files: JSON sources and their compiled binary form.
+
+A source level (``levels/<name>.json``) lists platforms, collectible spawns
+and enemy patrols. ``compile_source`` flattens it into a handful of typed
+arrays, and ``write_compiled``/``read_compiled`` store those arrays back to
+back in a ``.lvl`` file so loading is a few ``array.frombytes`` calls with
+no parsing and no per-entity Python objects.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+
+
+LEVEL_DIR = Path(__file__).resolve().parent / "levels"
+COMPILED_SUFFIX = ".lvl"
+MAGIC = b"BMRL"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+COUNT = struct.Struct("<I")
+
+ENEMY_KINDS = ("waiter", "police")
+
+# Flattened record widths: platforms are (x, y, w, h), spawns are
+# (x, surface_y, beer_lift, pretzel_lift) with odds (chance, beer_chance),
+# enemies are (kind, x, patrol_min, patrol_max) with one speed each.
+PLATFORM_FIELDS = 4
+SPAWN_FIELDS = 4
+ENEMY_FIELDS = 4
+
+
+@dataclass
+class Level:
+    name: str
+    width: int
+    platforms: array
+    spawns: array
+    spawn_odds: array
+    enemies: array
+    enemy_speeds: array
+
+    @property
+    def platform_count(self) -> int:
+        return len(self.platforms) // PLATFORM_FIELDS
+
+    @property
+    def spawn_count(self) -> int:
+        return len(self.spawns) // SPAWN_FIELDS
+
+    @property
+    def enemy_count(self) -> int:
+        return len(self.enemy_speeds)
+
+    def arrays(self) -> tuple[array, ...]:
+        return self.platforms, self.spawns, self.spawn_odds, self.enemies, self.enemy_speeds
+
+
+def empty_level(name: str, width: int) -> Level:
+    return Level(name, width, array("i"), array("i"), array("d"), array("i"), array("d"))
+
+
+def add_spawn(level: Level, x: int, surface_y: int, lift: list[int], chance: float, beer_chance: float) -> None:
+    level.spawns.extend((x, surface_y, lift[0], lift[1]))
+    level.spawn_odds.extend((chance, beer_chance))
+
+
+def compile_source(data: dict, ground_y: int) -> Level:
+    """Flatten a parsed JSON level into its array-backed form."""
+    level = empty_level(data.get("name", "untitled"), int(data["width"]))
+    for x, y, w, h in data.get("platforms", []):
+        level.platforms.extend((x, y, w, h))
+
+    for row in data.get("collectible_rows", []):
+        for x in range(row["start"], row["stop"], row["step"]):
+            add_spawn(level, x, row.get("y", ground_y), row["lift"], 1.0, row["beer_chance"])
+
+    on_platforms = data.get("platform_collectibles")
+    if on_platforms:
+        for x, y, w, _h in data.get("platforms", []):
+            cx = x + w // 2 - 12
+            add_spawn(level, cx, y, on_platforms["lift"], on_platforms["chance"], on_platforms["beer_chance"])
+
+    for spawn in data.get("collectibles", []):
+        beer_chance = {"beer": 1.0, "pretzel": 0.0}.get(spawn.get("kind", "random"), spawn.get("beer_chance", 0.6))
+        add_spawn(level, spawn["x"], spawn.get("y", ground_y), spawn.get("lift", [40, 34]), spawn.get("chance", 1.0), beer_chance)
+
+    for enemy in data.get("enemies", []):
+        patrol_min, patrol_max = enemy["patrol"]
+        level.enemies.extend((ENEMY_KINDS.index(enemy["kind"]), enemy["x"], patrol_min, patrol_max))
+        level.enemy_speeds.append(enemy["speed"])
+    return level
+
+
+def write_compiled(level: Level, path: Path) -> None:
+    """Write ``level`` to ``path`` via a temporary file, so an interrupted write never leaves a truncated cache."""
+    name = level.name.encode("utf-8")
+    partial = path.with_name(path.name + ".tmp")
+    with partial.open("wb") as handle:
+        handle.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(name), level.width))
+        handle.write(name)
+        for values in level.arrays():
+            if sys.byteorder == "big":
+                values = array(values.typecode, values)
+                values.byteswap()
+            handle.write(COUNT.pack(len(values)))
+            handle.write(values.tobytes())
+    partial.replace(path)
+
+
+def read_compiled(path: Path) -> Level:
+    """Read a compiled level; a file that is truncated or not a current ``.lvl`` raises ValueError."""
+    raw = memoryview(path.read_bytes())
+    try:
+        return unpack_compiled(raw, path)
+    except struct.error:
+        raise ValueError(f"{path} is truncated") from None
+
+
+def unpack_compiled(raw: memoryview, path: Path) -> Level:
+    magic, version, name_len, width = HEADER.unpack_from(raw, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a version {FORMAT_VERSION} compiled level")
+    offset = HEADER.size
+    name = bytes(raw[offset:offset + name_len]).decode("utf-8")
+    offset += name_len
+
+    level = empty_level(name, width)
+    for values in level.arrays():
+        (count,) = COUNT.unpack_from(raw, offset)
+        offset += COUNT.size
+        size = count * values.itemsize
+        if offset + size > len(raw):
+            raise ValueError(f"{path} is truncated")
+        values.frombytes(raw[offset:offset + size])
+        if sys.byteorder == "big":
+            values.byteswap()
+        offset += size
+    return level
+
+
+def level_paths(name: str) -> tuple[Path, Path]:
+    source = Path(name) if name.endswith(".json") else LEVEL_DIR / f"{name}.json"
+    return source, source.with_suffix(COMPILED_SUFFIX)
+
+
+def parse_file(source: Path, ground_y: int) -> Level:
+    return compile_source(json.loads(source.read_text(encoding="utf-8")), ground_y)
+
+
+def load_level(name: str, ground_y: int) -> Level:
+    """Load a level by name, preferring an up-to-date compiled cache over the JSON source."""
+    source, compiled = level_paths(name)
+    if compiled.exists() and (not source.exists() or compiled.stat().st_mtime >= source.stat().st_mtime):
+        try:
+            return read_compiled(compiled)
+        except ValueError:
+            pass
+    level = parse_file(source, ground_y)
+    try:
+        write_compiled(level, compiled)
+    except OSError:
+        pass
+    return level
+
+
+def chunk_index(level: Level, chunk_width: int) -> dict[int, tuple[array, array, array]]:
+    """Group platform, spawn and enemy record indices by chunk.
+
+    Platforms are listed in every chunk they overlap; spawns and enemies in
+    the chunk their left edge falls in. Records past either end of the level
+    go to the edge chunk.
+    """
+    index: dict[int, tuple[array, array, array]] = {}
+    last_chunk = max(0, (level.width - 1) // chunk_width)
+
+    def bucket(x: int) -> tuple[array, array, array]:
+        chunk = min(max(x // chunk_width, 0), last_chunk)
+        entry = index.get(chunk)
+        if entry is None:
+            entry = index[chunk] = (array("i"), array("i"), array("i"))
+        return entry
+
+    for i in range(level.platform_count):
+        x, _y, w, _h = level.platforms[PLATFORM_FIELDS * i:PLATFORM_FIELDS * i + 4]
+        first = min(max(x // chunk_width, 0), last_chunk)
+        last = min(max((x + w - 1) // chunk_width, first), last_chunk)
+        for chunk in range(first, last + 1):
+            bucket(chunk * chunk_width)[0].append(i)
+    for i in range(level.spawn_count):
+        bucket(level.spawns[SPAWN_FIELDS * i])[1].append(i)
+    for i in range(level.enemy_count):
+        bucket(level.enemies[ENEMY_FIELDS * i + 1])[2].append(i)
+    return index
@@ -0,0 +1,144 @@
+"""Per-phase frame timing kept in fixed-size ring buffers."""
+
+from __future__ import annotations
+
+import csv
+import time
+from array import array
+from pathlib import Path
+
+
+PROFILE_PHASES = (
+    "Player.update",
+    "update_collectibles",
+    "update_projectiles",
+    "update_enemies",
+    "check_goal_state",
+    "update_camera",
+    "stream_chunks",
+    "draw_background",
+    "draw_solids",
+    "draw_goal_gate",
+    "draw_entities",
+    "upscale",
+    "draw_hud",
+    "draw_controls_hint",
+    "draw_state_overlay",
+    "display.flip",
+)
+RING_SIZE = 600
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class FrameProfiler:
+    """Times named phases with a lap clock and keeps the last ``size`` frames per phase.
+
+    ``begin`` restarts the lap clock, ``lap`` charges the time since the last
+    mark to a phase, and ``end_frame`` commits the frame to the ring buffers,
+    appends one row to the CSV when a path was given, and returns the total.
+    """
+
+    def __init__(self, phases: tuple[str, ...] = PROFILE_PHASES, size: int = RING_SIZE, csv_path: Path | None = None) -> None:
+        self.phases = phases
+        self.slots = {name: i for i, name in enumerate(phases)}
+        self.size = size
+        self.rings = [array("d", bytes(8 * size)) for _ in phases]
+        self.totals = array("d", bytes(8 * size))
+        self.current = array("d", bytes(8 * len(phases)))
+        self.frames = 0
+        self.mark = time.perf_counter()
+        self.csv_file = None
+        self.csv_writer = None
+        if csv_path is not None:
+            self.csv_file = open(csv_path, "w", newline="", encoding="utf-8")
+            self.csv_writer = csv.writer(self.csv_file)
+            self.csv_writer.writerow(("frame", *phases, "total_ms"))
+
+    def begin(self) -> None:
+        self.mark = time.perf_counter()
+
+    def lap(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.current[self.slots[phase]] += (now - self.mark) * 1000.0
+        self.mark = now
+
+    def end_frame(self) -> float:
+        slot = self.frames % self.size
+        total = 0.0
+        for ring, value in zip(self.rings, self.current):
+            ring[slot] = value
+            total += value
+        self.totals[slot] = total
+        if self.csv_writer is not None:
+            self.csv_writer.writerow((self.frames, *(f"{value:.4f}" for value in self.current), f"{total:.4f}"))
+        self.current = array("d", bytes(8 * len(self.phases)))
+        self.frames += 1
+        return total
+
+    def summary(self) -> list[tuple[str, float, float, float]]:
+        """(phase, p50, p95, p99) in milliseconds over the frames held in the rings."""
+        count = min(self.frames, self.size)
+        rows = []
+        for name, ring in (*zip(self.phases, self.rings), ("frame total", self.totals)):
+            ordered = sorted(ring[:count])
+            rows.append((name, percentile(ordered, 0.50), percentile(ordered, 0.95), percentile(ordered, 0.99)))
+        return rows
+
+    def close(self) -> None:
+        if self.csv_file is not None:
+            self.csv_file.close()
+            self.csv_file = None
+            self.csv_writer = None
+
+
+class LatencyMeter:
+    """Input-to-present latencies in milliseconds, the last ``size`` kept in a ring."""
+
+    def __init__(self, size: int = RING_SIZE) -> None:
+        self.size = size
+        self.ring = array("d", bytes(8 * size))
+        self.count = 0
+
+    def record(self, ms: float) -> None:
+        self.ring[self.count % self.size] = ms
+        self.count += 1
+
+    def summary(self) -> tuple[float, float, float, float]:
+        """(p50, p95, p99, max) over the samples held in the ring."""
+        ordered = sorted(self.ring[:min(self.count, self.size)])
+        return percentile(ordered, 0.50), percentile(ordered, 0.95), percentile(ordered, 0.99), ordered[-1] if ordered else 0.0
+
+    def report(self) -> str:
+        if not self.count:
+            return "Input to present: no samples"
+        p50, p95, p99, worst = self.summary()
+        held = min(self.count, self.size)
+        return f"Input to present over {held} inputs: p50 {p50:.1f} ms  p95 {p95:.1f} ms  p99 {p99:.1f} ms  max {worst:.1f} ms"
+
+
+class StartupTimer:
+    """Wall-clock marks from construction to the first presented frame and beyond."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.mark = self.started
+        self.phases: list[tuple[str, float]] = []
+
+    def lap(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.mark) * 1000.0))
+        self.mark = now
+
+    def add(self, phase: str, ms: float) -> None:
+        """Record a phase timed elsewhere, e.g. lazy work nested inside another phase."""
+        self.phases.append((phase, ms))
+
+    def report(self) -> str:
+        lines = [f"  {name:<28} {ms:8.1f} ms" for name, ms in self.phases]
+        lines.append(f"  {'total':<28} {(self.mark - self.started) * 1000.0:8.1f} ms")
+        return "Startup:\n" + "\n".join(lines)
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""Compile JSON level sources into the binary .lvl form loaded by the game."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, ROOT.as_posix())
+
+from game import GROUND_Y  # noqa: E402
+from levels import COMPILED_SUFFIX, LEVEL_DIR, parse_file, write_compiled  # noqa: E402
+
+
+def main() -> None:
+    sources = [Path(arg) for arg in sys.argv[1:]] or sorted(LEVEL_DIR.glob("*.json"))
+    for source in sources:
+        level = parse_file(source, GROUND_Y)
+        target = source.with_suffix(COMPILED_SUFFIX)
+        write_compiled(level, target)
+        print(
+            f"{source.name} -> {target.name}: {level.platform_count} platforms, "
+            f"{level.spawn_count} spawns, {level.enemy_count} enemies"
+        )
+
+
+if __name__ == "__main__":
+    main()
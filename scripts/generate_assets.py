@@ -1,96 +1,133 @@
 #!/usr/bin/env python3
-"""Generate simple Bavarian-themed sprite assets for the game."""
+"""Generate simple Bavarian-themed sprite assets for the game.
+
+All sprites registered in ``painters.py`` are painted at their in-game size
+and packed into one atlas image, ``atlas.png``, with ``atlas.json`` mapping
+each sprite name to its rect in the sheet and to the hash it was built from.
+The game loads the sheet once and slices subsurfaces.
+
+Builds are incremental: a sprite's hash covers its painter's source and its
+size, and each rendered sprite is kept in a tile cache under that hash.
+Only sprites without a cached tile are painted, in a process pool, and the
+atlas is only repacked when some hash changed.
+"""
 
 from __future__ import annotations
 
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import pygame
 
 
 ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from painters import SPRITES, render  # noqa: E402
+
+
 OUT_DIR = ROOT / "assets" / "generated"
+CACHE_DIR = OUT_DIR / ".cache"
+ATLAS_IMAGE = OUT_DIR / "atlas.png"
+ATLAS_INDEX = OUT_DIR / "atlas.json"
+ATLAS_WIDTH = 256
+ATLAS_PADDING = 1
 
 
-def draw_player(surface: pygame.Surface) -> None:
-    surface.fill((0, 0, 0, 0))
-    pygame.draw.rect(surface, (43, 94, 188), (10, 20, 32, 30), border_radius=6)
-    pygame.draw.rect(surface, (245, 228, 202), (14, 4, 24, 20), border_radius=9)
-    pygame.draw.rect(surface, (210, 130, 70), (16, 10, 20, 8), border_radius=4)
-    pygame.draw.rect(surface, (245, 245, 245), (6, 22, 36, 8), border_radius=5)
-    pygame.draw.rect(surface, (82, 56, 38), (12, 50, 10, 12), border_radius=4)
-    pygame.draw.rect(surface, (82, 56, 38), (30, 50, 10, 12), border_radius=4)
+def sprite_hash(name: str) -> str:
+    spec = SPRITES[name]
+    digest = hashlib.sha256()
+    digest.update(inspect.getsource(spec.paint).encode("utf-8"))
+    digest.update(repr(spec.size).encode("ascii"))
+    return digest.hexdigest()[:16]
 
 
-def draw_waiter(surface: pygame.Surface) -> None:
-    surface.fill((0, 0, 0, 0))
-    pygame.draw.rect(surface, (32, 32, 32), (10, 20, 32, 34), border_radius=6)
-    pygame.draw.rect(surface, (245, 232, 205), (14, 4, 24, 20), border_radius=9)
-    pygame.draw.rect(surface, (230, 230, 230), (6, 24, 36, 8), border_radius=5)
-    pygame.draw.rect(surface, (60, 60, 60), (7, 13, 34, 5), border_radius=3)
-    pygame.draw.rect(surface, (72, 72, 72), (12, 54, 10, 10), border_radius=3)
-    pygame.draw.rect(surface, (72, 72, 72), (30, 54, 10, 10), border_radius=3)
-    pygame.draw.rect(surface, (190, 190, 190), (40, 12, 11, 5), border_radius=3)
+def tile_path(digest: str) -> Path:
+    return CACHE_DIR / f"{digest}.png"
 
 
-def draw_police(surface: pygame.Surface) -> None:
-    surface.fill((0, 0, 0, 0))
-    pygame.draw.rect(surface, (28, 78, 166), (10, 20, 32, 34), border_radius=6)
-    pygame.draw.rect(surface, (245, 232, 205), (14, 4, 24, 20), border_radius=9)
-    pygame.draw.rect(surface, (18, 44, 110), (8, 11, 34, 6), border_radius=3)
-    pygame.draw.rect(surface, (225, 225, 225), (16, 28, 20, 5), border_radius=3)
-    pygame.draw.rect(surface, (26, 60, 130), (12, 54, 10, 10), border_radius=3)
-    pygame.draw.rect(surface, (26, 60, 130), (30, 54, 10, 10), border_radius=3)
+def paint_tile(name: str, digest: str) -> str:
+    """Worker: paint one sprite into the tile cache."""
+    pygame.image.save(render(name), tile_path(digest).as_posix())
+    return name
 
 
-def draw_beer(surface: pygame.Surface) -> None:
-    surface.fill((0, 0, 0, 0))
-    pygame.draw.rect(surface, (252, 198, 71), (6, 8, 14, 24), border_radius=5)
-    pygame.draw.rect(surface, (255, 244, 207), (5, 2, 16, 10), border_radius=5)
-    pygame.draw.rect(surface, (238, 238, 238), (18, 12, 6, 12), border_radius=3)
-    pygame.draw.rect(surface, (255, 255, 255), (8, 11, 3, 15), border_radius=2)
+def pack(sizes: dict[str, tuple[int, int]], width: int) -> tuple[dict[str, tuple[int, int, int, int]], int]:
+    """Shelf-pack sprites tallest first; returns name -> (x, y, w, h) and the sheet height."""
+    rects: dict[str, tuple[int, int, int, int]] = {}
+    x = y = shelf = 0
+    for name, (w, h) in sorted(sizes.items(), key=lambda item: (-item[1][1], -item[1][0], item[0])):
+        if x and x + w > width:
+            x, y, shelf = 0, y + shelf + ATLAS_PADDING, 0
+        rects[name] = (x, y, w, h)
+        x += w + ATLAS_PADDING
+        shelf = max(shelf, h)
+    return rects, y + shelf
 
 
-def draw_pretzel(surface: pygame.Surface) -> None:
-    surface.fill((0, 0, 0, 0))
-    pygame.draw.circle(surface, (177, 109, 56), (11, 12), 7, 5)
-    pygame.draw.circle(surface, (177, 109, 56), (21, 12), 7, 5)
-    pygame.draw.circle(surface, (177, 109, 56), (16, 21), 7, 5)
-    pygame.draw.circle(surface, (232, 202, 146), (16, 21), 1)
+def build_atlas(hashes: dict[str, str]) -> tuple[pygame.Surface, dict[str, tuple[int, int, int, int]]]:
+    rects, height = pack({name: spec.size for name, spec in SPRITES.items()}, ATLAS_WIDTH)
+    sheet = pygame.Surface((ATLAS_WIDTH, height), pygame.SRCALPHA)
+    sheet.fill((0, 0, 0, 0))
+    for name, digest in hashes.items():
+        sheet.blit(pygame.image.load(tile_path(digest).as_posix()), rects[name][:2])
+    return sheet, rects
 
 
-def draw_mug(surface: pygame.Surface) -> None:
-    surface.fill((0, 0, 0, 0))
-    pygame.draw.rect(surface, (235, 235, 235), (5, 7, 16, 15), border_radius=4)
-    pygame.draw.rect(surface, (249, 200, 86), (7, 9, 12, 11), border_radius=3)
-    pygame.draw.rect(surface, (235, 235, 235), (18, 10, 5, 9), border_radius=3)
+def previous_hashes() -> dict[str, str]:
+    if not (ATLAS_IMAGE.exists() and ATLAS_INDEX.exists()):
+        return {}
+    try:
+        return json.loads(ATLAS_INDEX.read_text(encoding="utf-8")).get("hashes", {})
+    except ValueError:
+        return {}
 
 
-def draw_stun(surface: pygame.Surface) -> None:
-    surface.fill((0, 0, 0, 0))
-    points = [(14, 1), (18, 10), (27, 10), (19, 16), (23, 26), (11, 17), (3, 17), (9, 10), (1, 10)]
-    pygame.draw.polygon(surface, (247, 212, 87), points)
-    pygame.draw.polygon(surface, (171, 129, 21), points, width=2)
+def render_tiles(jobs: list[tuple[str, str]], workers: int) -> None:
+    if workers <= 1 or len(jobs) <= 1:
+        for name, digest in jobs:
+            paint_tile(name, digest)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        for future in [pool.submit(paint_tile, name, digest) for name, digest in jobs]:
+            future.result()
 
 
-def create_and_save(name: str, size: tuple[int, int], painter) -> None:
-    surf = pygame.Surface(size, pygame.SRCALPHA)
-    painter(surf)
-    pygame.image.save(surf, (OUT_DIR / f"{name}.png").as_posix())
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Paint the sprite atlas")
+    parser.add_argument("--force", action="store_true", help="Repaint every sprite and rebuild the atlas")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes for painting")
+    return parser.parse_args()
 
 
 def main() -> None:
-    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    args = parse_args()
+    hashes = {name: sprite_hash(name) for name in SPRITES}
+    if not args.force and previous_hashes() == hashes:
+        print(f"Atlas in {OUT_DIR} is up to date")
+        return
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    jobs = [(name, digest) for name, digest in hashes.items() if args.force or not tile_path(digest).exists()]
+    render_tiles(jobs, args.jobs)
+
     pygame.init()
-    create_and_save("player", (46, 62), draw_player)
-    create_and_save("waiter", (50, 62), draw_waiter)
-    create_and_save("police", (50, 62), draw_police)
-    create_and_save("beer", (26, 34), draw_beer)
-    create_and_save("pretzel", (30, 30), draw_pretzel)
-    create_and_save("mug", (22, 22), draw_mug)
-    create_and_save("stun", (30, 30), draw_stun)
+    sheet, rects = build_atlas(hashes)
+    pygame.image.save(sheet, ATLAS_IMAGE.as_posix())
+    index = {
+        "size": list(sheet.get_size()),
+        "sprites": {name: list(rect) for name, rect in rects.items()},
+        "hashes": hashes,
+    }
+    ATLAS_INDEX.write_text(json.dumps(index, indent=2) + "\n", encoding="utf-8")
     pygame.quit()
-    print(f"Assets written to {OUT_DIR}")
+    print(f"Atlas with {len(rects)} sprites written to {OUT_DIR} ({len(jobs)} painted)")
 
 
 if __name__ == "__main__":